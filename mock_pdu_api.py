@@ -1,1096 +1,1598 @@
-"""
-Mock Schneider Electric SmartPDU Redfish-ish API (EC aggregation oriented)
-
-Run:
-  pip install fastapi uvicorn
-  uvicorn mock_pdu_api:app --reload --port 8000
-
-Test:
-  pip install pytest
-  pytest -q
-"""
-
-from __future__ import annotations
-
-import base64
-import secrets
-import time
-from dataclasses import dataclass
-from typing import Any, Dict, Optional, Tuple
-
-from fastapi import FastAPI, Header, HTTPException, Request, Response
-from fastapi.responses import JSONResponse
-
-app = FastAPI(title="Mock SmartPDU Redfish API", version="0.2.0")
-
-
-# -------------------------
-# Static config / identity
-# -------------------------
-
-PDU_ID = "2"
-PDU_MODEL = "Schneider Electric SmartPDU (Mock) 48-outlet"
-OUTLET_COUNT = 48
-BRANCH_COUNT = 3
-MAINS_PHASES = 3
-
-DEFAULT_ADMIN_USER = "admin"
-DEFAULT_ADMIN_PASS = "123456789"
-
-SERVICE_UUID = "b2a6f2b7-5c4a-4ab3-a8df-51c6c5f3db66"
-
-NOMINAL_VOLTAGE = 230.0
-NOMINAL_FREQ = 50.0
-
-START_EPOCH = time.time()
-
-# Outlet connection/load model (W). Outlets not listed => not connected => ~0W
-CONNECTED_OUTLET_LOAD_W: Dict[int, float] = {
-    1: 140.0,
-    2: 45.0,
-    3: 90.0,
-    10: 220.0,
-    12: 75.0,
-    20: 180.0,
-    44: 260.0,  # referenced in your doc snippet
-}
-
-# In-memory outlet state
-OUTLET_STATE: Dict[int, str] = {i: "On" for i in range(1, OUTLET_COUNT + 1)}
-
-
-# -------------------------
-# In-memory state
-# -------------------------
-
-@dataclass
-class Session:
-    session_id: str
-    username: str
-    token: str
-    created_epoch: float
-
-
-@dataclass
-class Subscription:
-    sub_id: str
-    destination: str
-    event: str
-    context: str
-    protocol: str
-    created_epoch: float
-
-
-USERS: Dict[str, Dict[str, Any]] = {
-    DEFAULT_ADMIN_USER: {
-        "username": DEFAULT_ADMIN_USER,
-        "password": DEFAULT_ADMIN_PASS,
-        "role": "Administrator",
-        "enabled": True,
-    }
-}
-
-SESSIONS: Dict[str, Session] = {}
-TOKENS_TO_SESSION: Dict[str, str] = {}
-SUBSCRIPTIONS: Dict[str, Subscription] = {}
-
-
-# -------------------------
-# Redfish-ish helpers
-# -------------------------
-
-def rf_status(state: str = "Enabled", health: str = "OK") -> dict:
-    return {"State": state, "Health": health}
-
-
-def rf_resource(
-    *,
-    odata_id: str,
-    odata_type: str,
-    rid: str,
-    name: str,
-    status: Optional[dict] = None,
-    **fields: Any,
-) -> dict:
-    return {
-        "@odata.id": odata_id,
-        "@odata.type": odata_type,
-        "Id": rid,
-        "Name": name,
-        "Status": status or rf_status(),
-        **fields,
-    }
-
-
-def rf_collection(
-    *,
-    odata_id: str,
-    odata_type: str,
-    name: str,
-    member_uris: list[str],
-) -> dict:
-    return {
-        "@odata.id": odata_id,
-        "@odata.type": odata_type,
-        "Name": name,
-        "Members@odata.count": len(member_uris),
-        "Members": [{"@odata.id": u} for u in member_uris],
-    }
-
-
-def rf_sensor(
-    *,
-    odata_id: str,
-    rid: str,
-    name: str,
-    reading: Optional[float],
-    units: str,
-    reading_type: str,
-    context: str,
-    status: Optional[dict] = None,
-    **fields: Any,
-) -> dict:
-    payload = {
-        "@odata.id": odata_id,
-        "@odata.type": "#Sensor.v1_7_0.Sensor",
-        "Id": rid,
-        "Name": name,
-        "Status": status or rf_status(),
-        "ReadingType": reading_type,
-        "PhysicalContext": context,
-        "ReadingUnits": units,
-        "Reading": None if reading is None else round(float(reading), 4),
-        **fields,
-    }
-    return payload
-
-
-def rf_error_payload(code: str, message: str, extended: Optional[list[dict]] = None) -> dict:
-    err = {"code": code, "message": message}
-    if extended:
-        err["@Message.ExtendedInfo"] = extended
-    return {"error": err}
-
-
-def raise_rf(status: int, code: str, message: str) -> None:
-    # We keep detail as dict, and our exception handler below will return it as JSON.
-    raise HTTPException(status_code=status, detail=rf_error_payload(code, message))
-
-
-# -------------------------
-# Auth helpers
-# -------------------------
-
-def _parse_basic_auth(authorization: Optional[str]) -> Tuple[str, str]:
-    if not authorization or not authorization.startswith("Basic "):
-        raise_rf(401, "Base.1.0.InsufficientPrivilege", "Missing or invalid Authorization header (Basic required)")
-    b64 = authorization.split(" ", 1)[1].strip()
-    try:
-        raw = base64.b64decode(b64).decode("utf-8")
-    except Exception:
-        raise_rf(401, "Base.1.0.InsufficientPrivilege", "Invalid Basic auth encoding")
-    if ":" not in raw:
-        raise_rf(401, "Base.1.0.InsufficientPrivilege", "Invalid Basic auth format")
-    username, password = raw.split(":", 1)
-    return username, password
-
-
-def require_basic_auth(request: Request) -> str:
-    authorization = request.headers.get("Authorization")
-    username, password = _parse_basic_auth(authorization)
-    user = USERS.get(username)
-    if not user or user["password"] != password or not user.get("enabled", False):
-        raise_rf(401, "Base.1.0.InvalidAuthenticationToken", "Invalid credentials")
-    return username
-
-
-def require_token(x_authtoken: Optional[str]) -> Session:
-    if not x_authtoken:
-        raise_rf(401, "Base.1.0.InvalidAuthenticationToken", "Missing X-Auth-Token")
-    session_id = TOKENS_TO_SESSION.get(x_authtoken)
-    if not session_id or session_id not in SESSIONS:
-        raise_rf(401, "Base.1.0.InvalidAuthenticationToken", "Invalid X-Auth-Token")
-    return SESSIONS[session_id]
-
-
-# -------------------------
-# Measurement model 
-# -------------------------
-
-def _small_jitter(seed: int) -> float:
-    # deterministic jitter in [-0.03, +0.03]
-    v = (seed * 1103515245 + 12345) & 0x7FFFFFFF
-    return ((v % 6001) / 6000.0) * 0.06 - 0.03
-
-
-def outlet_connected(outlet: int) -> bool:
-    return outlet in CONNECTED_OUTLET_LOAD_W
-
-
-def outlet_load_w(outlet: int) -> float:
-    if OUTLET_STATE.get(outlet, "On") != "On":
-        return 0.0
-    base = CONNECTED_OUTLET_LOAD_W.get(outlet, 0.0)
-    if base <= 0:
-        return 0.0
-    seconds = int(time.time() - START_EPOCH)
-    jitter = _small_jitter(seed=outlet * 100000 + seconds // 5)
-    return max(0.0, base * (1.0 + jitter))
-
-
-def outlet_voltage_v(outlet: int) -> float:
-    seconds = int(time.time() - START_EPOCH)
-    jitter = _small_jitter(seed=outlet * 999 + seconds // 10)
-    return NOMINAL_VOLTAGE * (1.0 + jitter * 0.15)
-
-
-def outlet_current_a(outlet: int) -> float:
-    v = outlet_voltage_v(outlet)
-    p = outlet_load_w(outlet)
-    if v <= 0.0:
-        return 0.0
-    return p / v
-
-
-def outlet_energy_kwh(outlet: int) -> float:
-    # monotonic accumulation based on configured base load for stable tests.
-    hours = (time.time() - START_EPOCH) / 3600.0
-    base = CONNECTED_OUTLET_LOAD_W.get(outlet, 0.0)
-    if OUTLET_STATE.get(outlet, "On") != "On":
-        base = 0.0
-    return max(0.0, (base * hours) / 1000.0)
-
-
-def pdu_total_power_w() -> float:
-    return sum(outlet_load_w(i) for i in range(1, OUTLET_COUNT + 1))
-
-
-def pdu_total_energy_kwh() -> float:
-    return sum(outlet_energy_kwh(i) for i in range(1, OUTLET_COUNT + 1))
-
-
-def mains_voltage_v(phase: int) -> float:
-    seconds = int(time.time() - START_EPOCH)
-    jitter = _small_jitter(seed=phase * 123456 + seconds // 10)
-    return NOMINAL_VOLTAGE * (1.0 + jitter * 0.10)
-
-
-def mains_current_a(phase: int) -> float:
-    p = pdu_total_power_w()
-    v = mains_voltage_v(phase)
-    if v <= 0:
-        return 0.0
-    return (p / MAINS_PHASES) / v
-
-
-def freq_hz() -> float:
-    seconds = int(time.time() - START_EPOCH)
-    jitter = _small_jitter(seed=424242 + seconds // 30)
-    return NOMINAL_FREQ * (1.0 + jitter * 0.01)
-
-
-# -------------------------
-# Error handling
-# -------------------------
-
-@app.exception_handler(HTTPException)
-async def http_exception_handler(_: Request, exc: HTTPException):
-    # If detail is already a Redfish-like dict, return it. Otherwise wrap it.
-    if isinstance(exc.detail, dict) and "error" in exc.detail:
-        return JSONResponse(status_code=exc.status_code, content=exc.detail)
-    return JSONResponse(
-        status_code=exc.status_code,
-        content=rf_error_payload("Base.1.0.GeneralError", str(exc.detail)),
-    )
-
-
-# -------------------------
-# GET endpoints (Basic Auth)
-# -------------------------
-
-@app.get("/redfish/v1/")
-def get_root(request: Request):
-    require_basic_auth(request)
-    # ServiceRoot generally doesn’t include Status
-    return {
-        "@odata.id": "/redfish/v1/",
-        "@odata.type": "#ServiceRoot.v1_15_0.ServiceRoot",
-        "Id": "RootService",
-        "Name": "Root Service",
-        "RedfishVersion": "1.10.0",
-        "UUID": SERVICE_UUID,
-        "SessionService": {"@odata.id": "/redfish/v1/SessionService"},
-        "AccountService": {"@odata.id": "/redfish/v1/AccountService"},
-        "Managers": {"@odata.id": "/redfish/v1/Managers"},
-        "PowerEquipment": {"@odata.id": "/redfish/v1/PowerEquipment"},
-        "EventService": {"@odata.id": "/redfish/v1/EventService"},
-    }
-
-
-# ---- SessionService
-
-@app.get("/redfish/v1/SessionService")
-def get_session_service(request: Request):
-    require_basic_auth(request)
-    return rf_resource(
-        odata_id="/redfish/v1/SessionService",
-        odata_type="#SessionService.v1_1_0.SessionService",
-        rid="SessionService",
-        name="Session Service",
-        Sessions={"@odata.id": "/redfish/v1/SessionService/Sessions"},
-    )
-
-
-@app.get("/redfish/v1/SessionService/Sessions")
-def get_sessions(request: Request):
-    require_basic_auth(request)
-    members = [f"/redfish/v1/SessionService/Sessions/{sid}" for sid in sorted(SESSIONS.keys())]
-    return rf_collection(
-        odata_id="/redfish/v1/SessionService/Sessions",
-        odata_type="#SessionCollection.SessionCollection",
-        name="Session Collection",
-        member_uris=members,
-    )
-
-
-@app.get("/redfish/v1/SessionService/Sessions/{session_id}")
-def get_session(request: Request, session_id: str):
-    require_basic_auth(request)
-    s = SESSIONS.get(session_id)
-    if not s:
-        raise_rf(404, "Base.1.0.ResourceMissingAtURI", "Session not found")
-    return rf_resource(
-        odata_id=f"/redfish/v1/SessionService/Sessions/{session_id}",
-        odata_type="#Session.v1_1_0.Session",
-        rid=s.session_id,
-        name="Session",
-        status=rf_status(),
-        UserName=s.username,
-        Created=s.created_epoch,
-    )
-
-
-# ---- AccountService
-
-@app.get("/redfish/v1/AccountService")
-def get_account_service(request: Request):
-    require_basic_auth(request)
-    return rf_resource(
-        odata_id="/redfish/v1/AccountService",
-        odata_type="#AccountService.v1_5_0.AccountService",
-        rid="AccountService",
-        name="Account Service",
-        Accounts={"@odata.id": "/redfish/v1/AccountService/Accounts"},
-        Roles={"@odata.id": "/redfish/v1/AccountService/Roles"},
-    )
-
-
-@app.get("/redfish/v1/AccountService/Accounts")
-def get_accounts(request: Request):
-    require_basic_auth(request)
-    members = [f"/redfish/v1/AccountService/Accounts/{u}" for u in sorted(USERS.keys())]
-    return rf_collection(
-        odata_id="/redfish/v1/AccountService/Accounts",
-        odata_type="#ManagerAccountCollection.ManagerAccountCollection",
-        name="Account Collection",
-        member_uris=members,
-    )
-
-
-@app.get("/redfish/v1/AccountService/Accounts/{username}")
-def get_account(request: Request, username: str):
-    require_basic_auth(request)
-    u = USERS.get(username)
-    if not u:
-        raise_rf(404, "Base.1.0.ResourceMissingAtURI", "User not found")
-    return rf_resource(
-        odata_id=f"/redfish/v1/AccountService/Accounts/{username}",
-        odata_type="#ManagerAccount.v1_9_0.ManagerAccount",
-        rid=username,
-        name=f"Account {username}",
-        UserName=u["username"],
-        RoleId=u["role"],
-        Enabled=bool(u["enabled"]),
-    )
-
-
-@app.get("/redfish/v1/AccountService/Roles")
-def get_roles(request: Request):
-    require_basic_auth(request)
-    roles = ["Administrator", "Operator", "ReadOnly"]
-    members = [f"/redfish/v1/AccountService/Roles/{r}" for r in roles]
-    return rf_collection(
-        odata_id="/redfish/v1/AccountService/Roles",
-        odata_type="#RoleCollection.RoleCollection",
-        name="Role Collection",
-        member_uris=members,
-    )
-
-
-@app.get("/redfish/v1/AccountService/Roles/{rolename}")
-def get_role(request: Request, rolename: str):
-    require_basic_auth(request)
-    if rolename not in {"Administrator", "Operator", "ReadOnly"}:
-        raise_rf(404, "Base.1.0.ResourceMissingAtURI", "Role not found")
-    return rf_resource(
-        odata_id=f"/redfish/v1/AccountService/Roles/{rolename}",
-        odata_type="#Role.v1_3_0.Role",
-        rid=rolename,
-        name=rolename,
-    )
-
-
-# ---- Managers
-
-@app.get("/redfish/v1/Managers")
-def get_managers(request: Request):
-    require_basic_auth(request)
-    members = ["/redfish/v1/Managers/manager"]
-    return rf_collection(
-        odata_id="/redfish/v1/Managers",
-        odata_type="#ManagerCollection.ManagerCollection",
-        name="Manager Collection",
-        member_uris=members,
-    )
-
-
-@app.get("/redfish/v1/Managers/manager")
-def get_manager(request: Request):
-    require_basic_auth(request)
-    return rf_resource(
-        odata_id="/redfish/v1/Managers/manager",
-        odata_type="#Manager.v1_11_0.Manager",
-        rid="manager",
-        name="Mock PDU Manager",
-        NetworkProtocol={"@odata.id": "/redfish/v1/Managers/managers/NetworkProtocol"},
-        LogServices={"@odata.id": "/redfish/v1/Managers/1/LogServices"},
-    )
-
-
-@app.get("/redfish/v1/Managers/managers/NetworkProtocol")
-def get_network_protocol(request: Request):
-    require_basic_auth(request)
-    return rf_resource(
-        odata_id="/redfish/v1/Managers/managers/NetworkProtocol",
-        odata_type="#ManagerNetworkProtocol.v1_6_0.ManagerNetworkProtocol",
-        rid="NetworkProtocol",
-        name="Network Protocol",
-        HTTP={"Port": 80},
-        HTTPS={"Port": 443},
-        SSDP={"ProtocolEnabled": False},
-    )
-
-
-@app.get("/redfish/v1/Managers/1/LogServices")
-def get_log_services(request: Request):
-    require_basic_auth(request)
-    members = ["/redfish/v1/Managers/1/LogServices/Log"]
-    return rf_collection(
-        odata_id="/redfish/v1/Managers/1/LogServices",
-        odata_type="#LogServiceCollection.LogServiceCollection",
-        name="Log Service Collection",
-        member_uris=members,
-    )
-
-
-@app.get("/redfish/v1/Managers/1/LogServices/Log")
-def get_log(request: Request):
-    require_basic_auth(request)
-    return rf_resource(
-        odata_id="/redfish/v1/Managers/1/LogServices/Log",
-        odata_type="#LogService.v1_2_0.LogService",
-        rid="Log",
-        name="System Log",
-        Entries={"@odata.id": "/redfish/v1/Managers/1/LogServices/Log/Entries"},
-    )
-
-
-@app.get("/redfish/v1/Managers/1/LogServices/Log/Entries")
-def get_log_entries(request: Request):
-    require_basic_auth(request)
-    # A lightweight Entries “collection-like” payload
-    entries = [
-        {
-            "@odata.id": "/redfish/v1/Managers/1/LogServices/Log/Entries/1",
-            "@odata.type": "#LogEntry.v1_9_0.LogEntry",
-            "Id": "1",
-            "Name": "Log Entry 1",
-            "Message": "Mock PDU boot",
-            "Created": START_EPOCH,
-            "Severity": "OK",
-        },
-        {
-            "@odata.id": "/redfish/v1/Managers/1/LogServices/Log/Entries/2",
-            "@odata.type": "#LogEntry.v1_9_0.LogEntry",
-            "Id": "2",
-            "Name": "Log Entry 2",
-            "Message": "REST API enabled",
-            "Created": START_EPOCH + 1,
-            "Severity": "OK",
-        },
-    ]
-    return {
-        "@odata.id": "/redfish/v1/Managers/1/LogServices/Log/Entries",
-        "@odata.type": "#LogEntryCollection.LogEntryCollection",
-        "Name": "Log Entry Collection",
-        "Members@odata.count": len(entries),
-        "Members": entries,
-    }
-
-
-# ---- PowerEquipment
-
-@app.get("/redfish/v1/PowerEquipment")
-def get_power_equipment(request: Request):
-    require_basic_auth(request)
-    return rf_resource(
-        odata_id="/redfish/v1/PowerEquipment",
-        odata_type="#PowerEquipment.v1_0_0.PowerEquipment",
-        rid="PowerEquipment",
-        name="Power Equipment",
-        RackPDUs={"@odata.id": "/redfish/v1/PowerEquipment/RackPDUs"},
-    )
-
-
-@app.get("/redfish/v1/PowerEquipment/RackPDUs")
-def get_rack_pdus(request: Request):
-    require_basic_auth(request)
-    members = [f"/redfish/v1/PowerEquipment/RackPDUs/{PDU_ID}"]
-    return rf_collection(
-        odata_id="/redfish/v1/PowerEquipment/RackPDUs",
-        odata_type="#PowerDistributionCollection.PowerDistributionCollection",
-        name="Rack PDU Collection",
-        member_uris=members,
-    )
-
-
-@app.get("/redfish/v1/PowerEquipment/RackPDUs/{pdu_id}")
-def get_rack_pdu(request: Request, pdu_id: str):
-    require_basic_auth(request)
-    if pdu_id != PDU_ID:
-        raise_rf(404, "Base.1.0.ResourceMissingAtURI", "PDU not found")
-
-    return rf_resource(
-        odata_id=f"/redfish/v1/PowerEquipment/RackPDUs/{PDU_ID}",
-        odata_type="#PowerDistribution.v1_1_0.PowerDistribution",
-        rid=PDU_ID,
-        name=f"Rack PDU {PDU_ID}",
-        Model=PDU_MODEL,
-        SerialNumber=f"SE-MOCK-{PDU_ID.zfill(4)}",
-        Manufacturer="Schneider Electric",
-        Outlets={"@odata.id": f"/redfish/v1/PowerEquipment/RackPDUs/{PDU_ID}/Outlets"},
-        Branches={"@odata.id": f"/redfish/v1/PowerEquipment/RackPDUs/{PDU_ID}/Branches"},
-        Mains={"@odata.id": f"/redfish/v1/PowerEquipment/RackPDUs/{PDU_ID}/Mains"},
-        Metrics={"@odata.id": f"/redfish/v1/PowerEquipment/RackPDUs/{PDU_ID}/Metrics"},
-        Sensors={"@odata.id": f"/redfish/v1/PowerEquipment/RackPDUs/{PDU_ID}/Sensors"},
-    )
-
-
-# ---- Metrics
-
-@app.get("/redfish/v1/PowerEquipment/RackPDUs/{pdu_id}/Metrics")
-def get_metrics(request: Request, pdu_id: str):
-    require_basic_auth(request)
-    if pdu_id != PDU_ID:
-        raise_rf(404, "Base.1.0.ResourceMissingAtURI", "PDU not found")
-
-    return rf_resource(
-        odata_id=f"/redfish/v1/PowerEquipment/RackPDUs/{PDU_ID}/Metrics",
-        odata_type="#PowerMetrics.v1_0_0.PowerMetrics",
-        rid=f"Metrics-{PDU_ID}",
-        name="PDU Metrics",
-        # EC aggregation friendly fields:
-        PowerWatts=round(pdu_total_power_w(), 2),
-        EnergykWh=round(pdu_total_energy_kwh(), 4),
-        FrequencyHz=round(freq_hz(), 2),
-    )
-
-
-# ---- Branches
-
-@app.get("/redfish/v1/PowerEquipment/RackPDUs/{pdu_id}/Branches")
-def get_branches(request: Request, pdu_id: str):
-    require_basic_auth(request)
-    if pdu_id != PDU_ID:
-        raise_rf(404, "Base.1.0.ResourceMissingAtURI", "PDU not found")
-    members = [f"/redfish/v1/PowerEquipment/RackPDUs/{PDU_ID}/Branches/{i}" for i in range(1, BRANCH_COUNT + 1)]
-    return rf_collection(
-        odata_id=f"/redfish/v1/PowerEquipment/RackPDUs/{PDU_ID}/Branches",
-        odata_type="#CircuitCollection.CircuitCollection",
-        name="Branch Collection",
-        member_uris=members,
-    )
-
-
-@app.get("/redfish/v1/PowerEquipment/RackPDUs/{pdu_id}/Branches/{cbnumber}")
-def get_branch(request: Request, pdu_id: str, cbnumber: int):
-    require_basic_auth(request)
-    if pdu_id != PDU_ID:
-        raise_rf(404, "Base.1.0.ResourceMissingAtURI", "PDU not found")
-    if cbnumber < 1 or cbnumber > BRANCH_COUNT:
-        raise_rf(404, "Base.1.0.ResourceMissingAtURI", "Branch not found")
-
-    return rf_resource(
-        odata_id=f"/redfish/v1/PowerEquipment/RackPDUs/{PDU_ID}/Branches/{cbnumber}",
-        odata_type="#Circuit.v1_0_0.Circuit",
-        rid=str(cbnumber),
-        name=f"Branch {cbnumber}",
-    )
-
-
-# ---- Outlets
-
-@app.get("/redfish/v1/PowerEquipment/RackPDUs/{pdu_id}/Outlets")
-def get_outlets(request: Request, pdu_id: str):
-    require_basic_auth(request)
-    if pdu_id != PDU_ID:
-        raise_rf(404, "Base.1.0.ResourceMissingAtURI", "PDU not found")
-
-    members = [f"/redfish/v1/PowerEquipment/RackPDUs/{PDU_ID}/Outlets/{i}" for i in range(1, OUTLET_COUNT + 1)]
-    return rf_collection(
-        odata_id=f"/redfish/v1/PowerEquipment/RackPDUs/{PDU_ID}/Outlets",
-        odata_type="#OutletCollection.OutletCollection",
-        name="Outlet Collection",
-        member_uris=members,
-    )
-
-
-@app.get("/redfish/v1/PowerEquipment/RackPDUs/{pdu_id}/Outlets/{outletnumber}")
-def get_outlet(request: Request, pdu_id: str, outletnumber: int):
-    require_basic_auth(request)
-    if pdu_id != PDU_ID:
-        raise_rf(404, "Base.1.0.ResourceMissingAtURI", "PDU not found")
-    if outletnumber < 1 or outletnumber > OUTLET_COUNT:
-        raise_rf(404, "Base.1.0.ResourceMissingAtURI", "Outlet not found")
-
-    state = OUTLET_STATE[outletnumber]
-    connected = outlet_connected(outletnumber)
-    rated = CONNECTED_OUTLET_LOAD_W.get(outletnumber, 0.0)
-
-    return rf_resource(
-        odata_id=f"/redfish/v1/PowerEquipment/RackPDUs/{PDU_ID}/Outlets/{outletnumber}",
-        odata_type="#Outlet.v1_0_0.Outlet",
-        rid=str(outletnumber),
-        name=f"Outlet {outletnumber}",
-        # Redfish-ish status (Enabled if On, Disabled if Off)
-        status=rf_status(state="Enabled" if state == "On" else "Disabled", health="OK"),
-        Connected=connected,
-        RatedLoadWatts=rated,
-        # Actions advertised (even if you don't implement this action endpoint yet)
-        Actions={
-            "#Outlet.PowerControl": {
-                "target": f"/redfish/v1/PowerEquipment/RackPDUs/{PDU_ID}/Outlets/{outletnumber}/Actions/Outlet.PowerControl",
-                "PowerState@Redfish.AllowableValues": ["On", "Off", "Cycle"],
-            }
-        },
-    )
-
-
-# ---- Mains
-
-@app.get("/redfish/v1/PowerEquipment/RackPDUs/{pdu_id}/Mains")
-def get_mains(request: Request, pdu_id: str):
-    require_basic_auth(request)
-    if pdu_id != PDU_ID:
-        raise_rf(404, "Base.1.0.ResourceMissingAtURI", "PDU not found")
-
-    members = [f"/redfish/v1/PowerEquipment/RackPDUs/{PDU_ID}/Mains/AC1"]
-    return rf_collection(
-        odata_id=f"/redfish/v1/PowerEquipment/RackPDUs/{PDU_ID}/Mains",
-        odata_type="#PowerSupplyCollection.PowerSupplyCollection",
-        name="Mains Collection",
-        member_uris=members,
-    )
-
-
-@app.get("/redfish/v1/PowerEquipment/RackPDUs/{pdu_id}/Mains/AC1")
-def get_mains_ac1(request: Request, pdu_id: str):
-    require_basic_auth(request)
-    if pdu_id != PDU_ID:
-        raise_rf(404, "Base.1.0.ResourceMissingAtURI", "PDU not found")
-
-    return rf_resource(
-        odata_id=f"/redfish/v1/PowerEquipment/RackPDUs/{PDU_ID}/Mains/AC1",
-        odata_type="#PowerSupply.v1_5_0.PowerSupply",
-        rid="AC1",
-        name="Main AC Input",
-        Phases=MAINS_PHASES,
-    )
-
-
-# ---- Sensors index + Sensor GET (pattern matching the SmartPDU URL style)
-
-@app.get("/redfish/v1/PowerEquipment/RackPDUs/{pdu_id}/Sensors")
-def get_sensors_root(request: Request, pdu_id: str):
-    require_basic_auth(request)
-    if pdu_id != PDU_ID:
-        raise_rf(404, "Base.1.0.ResourceMissingAtURI", "PDU not found")
-
-    # Redfish would often provide a collection. Your device lists sensor endpoints by convention,
-    # so we keep it a resource and rely on the specific sensor URIs.
-    return rf_resource(
-        odata_id=f"/redfish/v1/PowerEquipment/RackPDUs/{PDU_ID}/Sensors",
-        odata_type="#SensorCollection.SensorCollection",
-        rid=f"Sensors-{PDU_ID}",
-        name="Sensors",
-        Note="Access individual sensors via /Sensors/<SensorId> (e.g., PowerOUTLET44, FreqMains, PDUPower).",
-    )
-
-
-@app.get("/redfish/v1/PowerEquipment/RackPDUs/{pdu_id}/Sensors/{sensor_id}")
-def get_sensor(request: Request, pdu_id: str, sensor_id: str):
-    require_basic_auth(request)
-    if pdu_id != PDU_ID:
-        raise_rf(404, "Base.1.0.ResourceMissingAtURI", "PDU not found")
-
-    base_uri = f"/redfish/v1/PowerEquipment/RackPDUs/{PDU_ID}/Sensors/{sensor_id}"
-
-    # Outlet sensors: CurrentOUTLET#, VoltageOUTLET#, PowerOUTLET#, EnergyOUTLET#
-    for prefix, rtype, units in (
-        ("CurrentOUTLET", "Current", "A"),
-        ("VoltageOUTLET", "Voltage", "V"),
-        ("PowerOUTLET", "Power", "W"),
-        ("EnergyOUTLET", "Energy", "kWh"),
-    ):
-        if sensor_id.startswith(prefix):
-            n_str = sensor_id[len(prefix):]
-            if not n_str.isdigit():
-                raise_rf(404, "Base.1.0.ResourceMissingAtURI", "Invalid outlet sensor format")
-            outlet = int(n_str)
-            if outlet < 1 or outlet > OUTLET_COUNT:
-                raise_rf(404, "Base.1.0.ResourceMissingAtURI", "Outlet not found")
-
-            if prefix == "CurrentOUTLET":
-                reading = outlet_current_a(outlet)
-            elif prefix == "VoltageOUTLET":
-                reading = outlet_voltage_v(outlet)
-            elif prefix == "PowerOUTLET":
-                reading = outlet_load_w(outlet)
-            else:
-                reading = outlet_energy_kwh(outlet)
-
-            health = "OK" if (outlet_connected(outlet) or prefix in ("VoltageOUTLET",)) else "OK"
-            status = rf_status(state="Enabled", health=health)
-
-            return rf_sensor(
-                odata_id=base_uri,
-                rid=sensor_id,
-                name=f"Outlet {outlet} {rtype}",
-                reading=reading,
-                units=units,
-                reading_type=rtype,
-                context="Outlet",
-                status=status,
-            )
-
-    # Mains sensors
-    if sensor_id == "FreqMains":
-        return rf_sensor(
-            odata_id=base_uri,
-            rid=sensor_id,
-            name="Mains Frequency",
-            reading=freq_hz(),
-            units="Hz",
-            reading_type="Frequency",
-            context="ACInput",
-        )
-
-    if sensor_id == "PDUPower":
-        return rf_sensor(
-            odata_id=base_uri,
-            rid=sensor_id,
-            name="PDU Total Power",
-            reading=pdu_total_power_w(),
-            units="W",
-            reading_type="Power",
-            context="PowerSubsystem",
-        )
-
-    if sensor_id.startswith("CurrentMains"):
-        phase_str = sensor_id[len("CurrentMains"):]
-        if not phase_str.isdigit():
-            raise_rf(404, "Base.1.0.ResourceMissingAtURI", "Invalid mains current sensor")
-        phase = int(phase_str)
-        if phase < 1 or phase > MAINS_PHASES:
-            raise_rf(404, "Base.1.0.ResourceMissingAtURI", "Mains phase not found")
-
-        return rf_sensor(
-            odata_id=base_uri,
-            rid=sensor_id,
-            name=f"Mains Phase {phase} Current",
-            reading=mains_current_a(phase),
-            units="A",
-            reading_type="Current",
-            context="ACInput",
-        )
-
-    if sensor_id.startswith("VoltageMains"):
-        idx_str = sensor_id[len("VoltageMains"):]
-        if not idx_str.isdigit():
-            raise_rf(404, "Base.1.0.ResourceMissingAtURI", "Invalid mains voltage sensor")
-        idx = int(idx_str)
-        if idx < 1 or idx > 6:
-            raise_rf(404, "Base.1.0.ResourceMissingAtURI", "Mains voltage index not found")
-        phase = ((idx - 1) % MAINS_PHASES) + 1
-
-        return rf_sensor(
-            odata_id=base_uri,
-            rid=sensor_id,
-            name=f"Mains Voltage Channel {idx} (Phase {phase})",
-            reading=mains_voltage_v(phase),
-            units="V",
-            reading_type="Voltage",
-            context="ACInput",
-        )
-
-    if sensor_id.startswith("PowerMains"):
-        idx_str = sensor_id[len("PowerMains"):]
-        if not idx_str.isdigit():
-            raise_rf(404, "Base.1.0.ResourceMissingAtURI", "Invalid mains power sensor")
-        idx = int(idx_str)
-        if idx < 1 or idx > 6:
-            raise_rf(404, "Base.1.0.ResourceMissingAtURI", "Mains power index not found")
-
-        return rf_sensor(
-            odata_id=base_uri,
-            rid=sensor_id,
-            name=f"Mains Power Channel {idx}",
-            reading=pdu_total_power_w() / 6.0,
-            units="W",
-            reading_type="Power",
-            context="ACInput",
-        )
-
-    raise_rf(404, "Base.1.0.ResourceMissingAtURI", "Unknown sensor")
-
-
-# ---- EventService
-
-@app.get("/redfish/v1/EventService")
-def get_event_service(request: Request):
-    require_basic_auth(request)
-    return rf_resource(
-        odata_id="/redfish/v1/EventService",
-        odata_type="#EventService.v1_6_0.EventService",
-        rid="EventService",
-        name="Event Service",
-        Subscriptions={"@odata.id": "/redfish/v1/EventService/Subscriptions"},
-    )
-
-
-@app.get("/redfish/v1/EventService/Subscriptions/{sub_id}")
-def get_subscription(request: Request, sub_id: str):
-    require_basic_auth(request)
-    s = SUBSCRIPTIONS.get(sub_id)
-    if not s:
-        raise_rf(404, "Base.1.0.ResourceMissingAtURI", "Subscription not found")
-
-    return rf_resource(
-        odata_id=f"/redfish/v1/EventService/Subscriptions/{sub_id}",
-        odata_type="#EventDestination.v1_8_0.EventDestination",
-        rid=sub_id,
-        name=f"Subscription {sub_id}",
-        Destination=s.destination,
-        EventTypes=[s.event],
-        Context=s.context,
-        Protocol=s.protocol,
-        Created=s.created_epoch,
-    )
-
-
-# -------------------------
-# POST endpoints
-# -------------------------
-
-@app.post("/redfish/v1/SessionService/Sessions")
-async def create_session(request: Request, response: Response):
-    # Accept body credentials exactly as your snippet
-    body = await request.json()
-    username = body.get("username")
-    password = body.get("password")
-    if not username or not password:
-        raise_rf(400, "Base.1.0.PropertyMissing", "username/password required")
-
-    user = USERS.get(username)
-    if not user or user["password"] != password:
-        raise_rf(401, "Base.1.0.InvalidAuthenticationToken", "Invalid credentials")
-
-    session_id = secrets.token_hex(8)
-    token = secrets.token_hex(16)
-
-    s = Session(session_id=session_id, username=username, token=token, created_epoch=time.time())
-    SESSIONS[session_id] = s
-    TOKENS_TO_SESSION[token] = session_id
-
-    response.headers["X-Auth-Token"] = token
-    response.headers["Location"] = f"/redfish/v1/SessionService/Sessions/{session_id}"
-    response.status_code = 201
-
-    return rf_resource(
-        odata_id=f"/redfish/v1/SessionService/Sessions/{session_id}",
-        odata_type="#Session.v1_1_0.Session",
-        rid=session_id,
-        name="Session",
-        UserName=username,
-        Created=s.created_epoch,
-        # Some implementations echo token in body (your original did); keep it for convenience
-        **{"X-Auth-Token": token},
-    )
-
-
-@app.post("/redfish/v1/AccountService/Accounts")
-async def create_account(request: Request, response: Response):
-    require_basic_auth(request)
-    body = await request.json()
-
-    username = body.get("UserName") or body.get("username")
-    password = body.get("Password") or body.get("password")
-    role = body.get("RoleId") or body.get("role") or "Operator"
-
-    if not username or not password:
-        raise_rf(400, "Base.1.0.PropertyMissing", "UserName/Password required")
-    if username in USERS:
-        raise_rf(409, "Base.1.0.ResourceAlreadyExists", "User already exists")
-
-    USERS[username] = {"username": username, "password": password, "role": role, "enabled": True}
-    response.status_code = 201
-    response.headers["Location"] = f"/redfish/v1/AccountService/Accounts/{username}"
-
-    return rf_resource(
-        odata_id=f"/redfish/v1/AccountService/Accounts/{username}",
-        odata_type="#ManagerAccount.v1_9_0.ManagerAccount",
-        rid=username,
-        name=f"Account {username}",
-        UserName=username,
-        RoleId=role,
-        Enabled=True,
-    )
-
-
-@app.post("/redfish/v1/EventService/Subscriptions")
-async def create_subscription(
-    request: Request,
-    response: Response,
-    x_authtoken: Optional[str] = Header(default=None, alias="X-Auth-Token"),
-):
-    require_token(x_authtoken)
-    body = await request.json()
-
-    destination = body.get("destination")
-    event = body.get("event", "Alert")
-    context = body.get("context", "")
-    protocol = body.get("protocol", "redfish")
-
-    if not destination:
-        raise_rf(400, "Base.1.0.PropertyMissing", "destination required")
-
-    sub_id = str(len(SUBSCRIPTIONS) + 1)
-    SUBSCRIPTIONS[sub_id] = Subscription(
-        sub_id=sub_id,
-        destination=destination,
-        event=event,
-        context=context,
-        protocol=protocol,
-        created_epoch=time.time(),
-    )
-
-    response.status_code = 201
-    response.headers["Location"] = f"/redfish/v1/EventService/Subscriptions/{sub_id}"
-
-    return rf_resource(
-        odata_id=f"/redfish/v1/EventService/Subscriptions/{sub_id}",
-        odata_type="#EventDestination.v1_8_0.EventDestination",
-        rid=sub_id,
-        name=f"Subscription {sub_id}",
-        Destination=destination,
-        EventTypes=[event],
-        Context=context,
-        Protocol=protocol,
-        Created=SUBSCRIPTIONS[sub_id].created_epoch,
-    )
-
-
-@app.post("/redfish/v1/PowerDistribution/{pdu_id}/PowerControl/Loadsegment/{loadseg_id}/")
-async def power_control_loadsegment(
-    pdu_id: str,
-    loadseg_id: str,
-    request: Request,
-    x_authtoken: Optional[str] = Header(default=None, alias="X-Auth-Token"),
-):
-    require_token(x_authtoken)
-    if pdu_id != PDU_ID:
-        raise_rf(404, "Base.1.0.ResourceMissingAtURI", "PDU not found")
-
-    body = await request.json()
-    action = (body.get("Action") or body.get("action") or "").strip().lower()
-    if action not in {"on", "off", "cycle"}:
-        raise_rf(400, "Base.1.0.PropertyValueNotInList", "Action must be one of: On, Off, Cycle")
-
-    try:
-        seg = int(loadseg_id)
-    except ValueError:
-        raise_rf(400, "Base.1.0.PropertyValueFormatError", "Invalid loadseg_id")
-
-    if seg not in {1, 2, 3}:
-        raise_rf(404, "Base.1.0.ResourceMissingAtURI", "Load segment not found")
-
-    # Simple mapping: segments are 16-outlet blocks: 1..16, 17..32, 33..48
-    start = (seg - 1) * 16 + 1
-    end = seg * 16
-
-    if action == "cycle":
-        for i in range(start, end + 1):
-            OUTLET_STATE[i] = "Off"
-        for i in range(start, end + 1):
-            OUTLET_STATE[i] = "On"
-    else:
-        new_state = "On" if action == "on" else "Off"
-        for i in range(start, end + 1):
-            OUTLET_STATE[i] = new_state
-
-    return rf_resource(
-        odata_id=f"/redfish/v1/PowerDistribution/{PDU_ID}/PowerControl/Loadsegment/{seg}/",
-        odata_type="#ActionResponse.v1_0_0.ActionResponse",
-        rid=f"Loadsegment-{seg}",
-        name="Loadsegment PowerControl Result",
-        PduId=pdu_id,
-        LoadSegment=seg,
-        ActionApplied=action,
-        OutletsAffected=[start, end],
-    )
-
-
-# -------------------------
-# DELETE endpoints (Basic Auth)
-# -------------------------
-
-@app.delete("/redfish/v1/SessionService/Sessions/{session_id}")
-def delete_session(request: Request, session_id: str):
-    require_basic_auth(request)
-    s = SESSIONS.pop(session_id, None)
-    if not s:
-        raise_rf(404, "Base.1.0.ResourceMissingAtURI", "Session not found")
-    TOKENS_TO_SESSION.pop(s.token, None)
-    # Redfish commonly returns 204 No Content
-    return Response(status_code=204)
-
-
-@app.delete("/redfish/v1/AccountService/Accounts/{username}")
-def delete_account(request: Request, username: str):
-    require_basic_auth(request)
-    if username == DEFAULT_ADMIN_USER:
-        raise_rf(403, "Base.1.0.InsufficientPrivilege", "Cannot delete admin user")
-    if username not in USERS:
-        raise_rf(404, "Base.1.0.ResourceMissingAtURI", "User not found")
-    USERS.pop(username, None)
-    return Response(status_code=204)
-
-
-@app.delete("/redfish/v1/EventService/Subscriptions/{sub_id}")
-def delete_subscription(request: Request, sub_id: str):
-    require_basic_auth(request)
-    if sub_id not in SUBSCRIPTIONS:
-        raise_rf(404, "Base.1.0.ResourceMissingAtURI", "Subscription not found")
-    SUBSCRIPTIONS.pop(sub_id, None)
-    return Response(status_code=204)
-
+"""
+Mock Schneider Electric SmartPDU Redfish-ish API (EC aggregation oriented)
+
+Run (development):
+  pip install fastapi uvicorn
+  uvicorn mock_pdu_api:app --reload --port 8000
+
+Run (load testing, multi-core):
+  pip install gunicorn
+  gunicorn mock_pdu_api:app -k uvicorn.workers.UvicornWorker \
+      -w $((2 * $(nproc) + 1)) --bind 0.0.0.0:8000
+
+Each gunicorn worker is an independent process, so SESSIONS / TOKENS /
+SUBSCRIPTIONS / OUTLET_STATE are per-worker — fine for a mock, but pin a
+single worker if a test needs state written through one connection to be
+visible on another. GET handlers are async and never block; only the POST
+handlers await the request body.
+
+Test:
+  pip install pytest
+  pytest -q
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import binascii
+import bisect
+import hashlib
+import hmac
+import itertools
+import re
+import secrets
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import orjson
+from fastapi import FastAPI, Header, HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+
+# orjson serializes the dict-heavy Redfish payloads several times faster than
+# stdlib json, so make it the default for every route that returns a dict.
+app = FastAPI(title="Mock SmartPDU Redfish API", version="0.2.0", default_response_class=ORJSONResponse)
+
+
+# -------------------------
+# Static config / identity
+# -------------------------
+
+PDU_ID = "2"
+PDU_MODEL = "Schneider Electric SmartPDU (Mock) 48-outlet"
+OUTLET_COUNT = 48
+BRANCH_COUNT = 3
+MAINS_PHASES = 3
+
+DEFAULT_ADMIN_USER = "admin"
+DEFAULT_ADMIN_PASS = "123456789"
+
+SERVICE_UUID = "b2a6f2b7-5c4a-4ab3-a8df-51c6c5f3db66"
+
+NOMINAL_VOLTAGE = 230.0
+NOMINAL_FREQ = 50.0
+
+START_EPOCH = time.time()
+
+# Outlet connection/load model (W). Outlets not listed => not connected => ~0W
+CONNECTED_OUTLET_LOAD_W: Dict[int, float] = {
+    1: 140.0,
+    2: 45.0,
+    3: 90.0,
+    10: 220.0,
+    12: 75.0,
+    20: 180.0,
+    44: 260.0,  # referenced in your doc snippet
+}
+
+# In-memory outlet state: byte i is 1 when outlet i is On, 0 when Off (index
+# 0 unused so positions line up with outlet numbers). A load-segment write is
+# then one slice assignment instead of 16 dict stores, and the byte layout
+# feeds the NumPy state mask directly.
+OUTLET_STATE = bytearray(b"\x01" * (OUTLET_COUNT + 1))
+_STATE_NAMES = ("Off", "On")
+
+
+def outlet_state(outlet: int) -> str:
+    return _STATE_NAMES[OUTLET_STATE[outlet]]
+
+
+# -------------------------
+# In-memory state
+# -------------------------
+
+@dataclass(slots=True)
+class Session:
+    session_id: str
+    username: str
+    token: str
+    created_epoch: float
+
+
+@dataclass(slots=True)
+class Subscription:
+    sub_id: str
+    destination: str
+    event: str
+    context: str
+    protocol: str
+    created_epoch: float
+
+
+# Shard count for _Store; power of two so the modulo is a mask.
+_STORE_SHARDS = 64
+
+
+class _Store:
+    """Sharded key/value store with lock-free reads and per-shard writes.
+
+    CPython dict lookups are atomic under the GIL, so the auth probes that
+    run on every request (`get`, `in`) read the owning shard directly
+    without taking any lock. Writers lock only the shard the key hashes
+    into (hash(key) & 63), so creates/deletes of unrelated keys proceed
+    concurrently instead of serializing on one store-wide lock.
+    delete_session-style compound removals snapshot the value first, then
+    pop each store in turn.
+    """
+
+    __slots__ = ("_shards", "_locks")
+
+    def __init__(self, data: Optional[dict] = None):
+        self._shards: list[dict] = [{} for _ in range(_STORE_SHARDS)]
+        self._locks = [threading.Lock() for _ in range(_STORE_SHARDS)]
+        if data:
+            for key, value in data.items():
+                self._shards[hash(key) & (_STORE_SHARDS - 1)][key] = value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._shards[hash(key) & (_STORE_SHARDS - 1)].get(key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        return self._shards[hash(key) & (_STORE_SHARDS - 1)][key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._shards[hash(key) & (_STORE_SHARDS - 1)]
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+    def set(self, key: str, value: Any) -> None:
+        i = hash(key) & (_STORE_SHARDS - 1)
+        with self._locks[i]:
+            self._shards[i][key] = value
+
+    def pop(self, key: str, default: Any = None) -> Any:
+        i = hash(key) & (_STORE_SHARDS - 1)
+        with self._locks[i]:
+            return self._shards[i].pop(key, default)
+
+
+# Passwords are stored salted and PBKDF2-hashed rather than as plaintext.
+# The iteration count is deliberate work per fresh verification; repeat
+# verifications hit the bounded cache in _verify_password instead.
+_PBKDF2_ITERATIONS = 100_000
+
+
+def _hash_password(password: str, salt: Optional[bytes] = None) -> Tuple[bytes, bytes]:
+    if salt is None:
+        salt = secrets.token_bytes(16)
+    return salt, hashlib.pbkdf2_hmac("sha256", password.encode(), salt, _PBKDF2_ITERATIONS)
+
+
+USERS = _Store({
+    DEFAULT_ADMIN_USER: {
+        "username": DEFAULT_ADMIN_USER,
+        "password_hash": _hash_password(DEFAULT_ADMIN_PASS),
+        "role": "Administrator",
+        "enabled": True,
+    }
+})
+
+SESSIONS = _Store()
+# Token -> Session directly: auth runs on every request, so keep it to one probe.
+TOKENS = _Store()
+SUBSCRIPTIONS = _Store()
+
+# Subscription ids come from a monotonic counter: next() on itertools.count is
+# atomic under the GIL, unlike len(SUBSCRIPTIONS) + 1, where two concurrent
+# creators can read the same length (and deletions make lengths reusable).
+_SUB_ID_COUNTER = itertools.count(1)
+
+# Sorted id indexes, maintained at create/delete time via bisect.insort /
+# list.remove so the collection GETs don't re-sort the keys on every request.
+# insort is a read-then-insert, so index mutations take their own lock.
+_INDEX_LOCK = threading.Lock()
+_SESSION_IDS_SORTED: list[str] = []
+_USERNAMES_SORTED: list[str] = [DEFAULT_ADMIN_USER]
+
+
+# -------------------------
+# Redfish-ish helpers
+# -------------------------
+
+def rf_status(state: str = "Enabled", health: str = "OK") -> dict:
+    return {"State": state, "Health": health}
+
+
+def rf_resource(
+    *,
+    odata_id: str,
+    odata_type: str,
+    rid: str,
+    name: str,
+    status: Optional[dict] = None,
+    **fields: Any,
+) -> dict:
+    return {
+        "@odata.id": odata_id,
+        "@odata.type": odata_type,
+        "Id": rid,
+        "Name": name,
+        "Status": status or rf_status(),
+        **fields,
+    }
+
+
+def rf_collection(
+    *,
+    odata_id: str,
+    odata_type: str,
+    name: str,
+    member_uris: list[str],
+) -> dict:
+    return {
+        "@odata.id": odata_id,
+        "@odata.type": odata_type,
+        "Name": name,
+        "Members@odata.count": len(member_uris),
+        "Members": [{"@odata.id": u} for u in member_uris],
+    }
+
+
+def rf_sensor(
+    *,
+    odata_id: str,
+    rid: str,
+    name: str,
+    reading: Optional[float],
+    units: str,
+    reading_type: str,
+    context: str,
+    status: Optional[dict] = None,
+    **fields: Any,
+) -> dict:
+    payload = {
+        "@odata.id": odata_id,
+        "@odata.type": "#Sensor.v1_7_0.Sensor",
+        "Id": rid,
+        "Name": name,
+        "Status": status or rf_status(),
+        "ReadingType": reading_type,
+        "PhysicalContext": context,
+        "ReadingUnits": units,
+        "Reading": None if reading is None else round(float(reading), 4),
+        **fields,
+    }
+    return payload
+
+
+def rf_error_payload(code: str, message: str, extended: Optional[list[dict]] = None) -> dict:
+    err = {"code": code, "message": message}
+    if extended:
+        err["@Message.ExtendedInfo"] = extended
+    return {"error": err}
+
+
+def raise_rf(status: int, code: str, message: str) -> None:
+    # We keep detail as dict, and our exception handler below will return it as JSON.
+    raise HTTPException(status_code=status, detail=rf_error_payload(code, message))
+
+
+# -------------------------
+# Auth helpers
+# -------------------------
+
+# Happy-path credential blob: nearly every request arrives as the default
+# admin, so compare the whole Authorization header against the precomputed
+# value and skip base64 decoding entirely. Non-default users fall through to
+# the full parse below.
+_EXPECTED_CRED = f"{DEFAULT_ADMIN_USER}:{DEFAULT_ADMIN_PASS}".encode()
+_EXPECTED_AUTH_HEADER = b"Basic " + base64.b64encode(_EXPECTED_CRED)
+
+
+def _parse_basic_auth(authorization: Optional[str]) -> Tuple[str, str]:
+    if not authorization or not authorization.startswith("Basic "):
+        raise_rf(401, "Base.1.0.InsufficientPrivilege", "Missing or invalid Authorization header (Basic required)")
+    b64 = authorization.split(" ", 1)[1].strip()
+    try:
+        raw = binascii.a2b_base64(b64).decode("utf-8")
+    except Exception:
+        raise_rf(401, "Base.1.0.InsufficientPrivilege", "Invalid Basic auth encoding")
+    if ":" not in raw:
+        raise_rf(401, "Base.1.0.InsufficientPrivilege", "Invalid Basic auth format")
+    username, password = raw.split(":", 1)
+    return username, password
+
+
+# Successful verifications, keyed by the account's unique salt plus a digest
+# of the presented password, so re-auth doesn't redo the PBKDF2 work. Bounded
+# (cleared when full) and only positive results are stored: failures stay
+# expensive and can't evict legitimate entries. Keying on the salt means a
+# recreated account (fresh salt) never matches stale entries.
+_PW_VERIFY_CACHE: Dict[Tuple[bytes, bytes], bool] = {}
+_PW_VERIFY_CACHE_MAX = 1024
+
+
+def _verify_password(user: Dict[str, Any], password: Any) -> bool:
+    # Body credentials come from arbitrary JSON; anything but a string can
+    # never match a stored hash.
+    if not isinstance(password, str):
+        return False
+    salt, expected = user["password_hash"]
+    key = (salt, hashlib.sha256(password.encode()).digest())
+    if _PW_VERIFY_CACHE.get(key):
+        return True
+    ok = hmac.compare_digest(
+        hashlib.pbkdf2_hmac("sha256", password.encode(), salt, _PBKDF2_ITERATIONS), expected
+    )
+    if ok:
+        if len(_PW_VERIFY_CACHE) >= _PW_VERIFY_CACHE_MAX:
+            _PW_VERIFY_CACHE.clear()
+        _PW_VERIFY_CACHE[key] = True
+    return ok
+
+
+def require_basic_auth(authorization: Optional[str]) -> str:
+    # Compare as bytes: headers arrive latin-1 decoded, and compare_digest on
+    # str rejects non-ASCII input, which must fall through to a 401, not 500.
+    if authorization is not None and secrets.compare_digest(
+        authorization.encode("latin-1", "ignore"), _EXPECTED_AUTH_HEADER
+    ):
+        return DEFAULT_ADMIN_USER
+    username, password = _parse_basic_auth(authorization)
+    user = USERS.get(username)
+    if not user or not user.get("enabled", False) or not _verify_password(user, password):
+        raise_rf(401, "Base.1.0.InvalidAuthenticationToken", "Invalid credentials")
+    return username
+
+
+# Per-request session, resolved once by the middleware below. Holds the
+# Session on success, None when no X-Auth-Token header was sent, or the raw
+# token string when one was sent but didn't resolve — so require_token can
+# keep the distinct missing/invalid errors from a single ContextVar read.
+_CURRENT_SESSION: ContextVar[Any] = ContextVar("smartpdu_session", default=None)
+
+
+class _TokenResolverMiddleware:
+    """Resolve X-Auth-Token into _CURRENT_SESSION once per request.
+
+    Endpoints then read the result with a C-level ContextVar get instead of
+    each dependency re-peeling the header and probing the token store.
+    """
+
+    __slots__ = ("app",)
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            token = None
+            for name, value in scope["headers"]:
+                if name == b"x-auth-token":
+                    token = value.decode("latin-1")
+                    break
+            _CURRENT_SESSION.set(TOKENS.get(token, token) if token else None)
+        await self.app(scope, receive, send)
+
+
+app.add_middleware(_TokenResolverMiddleware)
+
+
+def require_token() -> Session:
+    resolved = _CURRENT_SESSION.get()
+    if isinstance(resolved, Session):
+        return resolved
+    if resolved is None:
+        raise_rf(401, "Base.1.0.InvalidAuthenticationToken", "Missing X-Auth-Token")
+    raise_rf(401, "Base.1.0.InvalidAuthenticationToken", "Invalid X-Auth-Token")
+
+
+# -------------------------
+# Measurement model 
+# -------------------------
+
+def _small_jitter(seed: int) -> float:
+    # deterministic jitter in [-0.03, +0.03]
+    v = (seed * 1103515245 + 12345) & 0x7FFFFFFF
+    return ((v % 6001) / 6000.0) * 0.06 - 0.03
+
+
+def _small_jitter_vec(seeds: np.ndarray) -> np.ndarray:
+    # Same LCG as _small_jitter applied to a whole seed array in one NumPy
+    # pass. int64 holds the pre-mask product exactly, so the values match the
+    # scalar helper element for element. Bulk callers (the totals) use this;
+    # single-sensor GETs keep the scalar version.
+    v = (seeds * 1103515245 + 12345) & 0x7FFFFFFF
+    return ((v % 6001) / 6000.0) * 0.06 - 0.03
+
+
+def outlet_connected(outlet: int) -> bool:
+    return outlet in CONNECTED_OUTLET_LOAD_W
+
+
+# Tiny TTL memo for the derived measurement values. The jitter quantizes at
+# 5/10/30-second buckets, so every value is stable within a second; a 1-second
+# TTL collapses multi-sensor polling bursts (and the 48-outlet total-power sum)
+# into a single dict hit. Keys churn slowly, so the dict stays small.
+_MEASUREMENT_TTL_S = 1.0
+_MEASUREMENT_CACHE: Dict[Tuple[str, int], Tuple[float, Any]] = {}
+
+
+def _memo(key: Tuple[str, int], fn, now: Optional[float] = None) -> Any:
+    # Callers that already hold the current time pass it in; a Metrics request
+    # used to hit time.time() once per outlet per helper (~97 calls).
+    if now is None:
+        now = time.time()
+    hit = _MEASUREMENT_CACHE.get(key)
+    if hit is not None and now - hit[0] < _MEASUREMENT_TTL_S:
+        return hit[1]
+    value = fn()
+    _MEASUREMENT_CACHE[key] = (now, value)
+    return value
+
+
+def _invalidate_measurement_cache() -> None:
+    # Outlet state changes must be visible immediately, not a TTL later.
+    _MEASUREMENT_CACHE.clear()
+    _SENSOR_CACHE.clear()
+
+
+# Vectorized view of the outlet model. The totals used to call the scalar
+# jitter helper once per outlet inside a Python sum loop; with index 0 unused
+# so arrays line up with outlet numbers, the whole pass becomes a handful of
+# NumPy C-loop operations over these arrays.
+_OUTLET_IDX = np.arange(1, OUTLET_COUNT + 1, dtype=np.int64)
+_BASE_LOAD = np.zeros(OUTLET_COUNT + 1)
+for _outlet, _watts in CONNECTED_OUTLET_LOAD_W.items():
+    _BASE_LOAD[_outlet] = _watts
+_STATE_MASK = np.ones(OUTLET_COUNT + 1, dtype=bool)
+
+
+def _sync_state_mask() -> None:
+    # Keep the vectorized mask in step with OUTLET_STATE after mutations;
+    # the bytearray reinterprets straight into the bool array in one C pass.
+    _STATE_MASK[:] = np.frombuffer(OUTLET_STATE, dtype=np.uint8) != 0
+
+
+# Row indexes into the per-bucket outlet reading table.
+_KIND_CURRENT, _KIND_VOLTAGE, _KIND_POWER, _KIND_ENERGY = range(4)
+
+
+def _outlet_table(now: float) -> np.ndarray:
+    """Build the (4, OUTLET_COUNT) array of all outlet readings at `now`.
+
+    Pollers typically sweep Current/Voltage/Power/EnergyOUTLET* for all 48
+    outlets (192 requests per pass); one vectorized pass here feeds them all.
+    """
+    seconds = int(now - START_EPOCH)
+    power = _BASE_LOAD[1:] * (1.0 + _small_jitter_vec(_OUTLET_IDX * 100000 + seconds // 5)) * _STATE_MASK[1:]
+    np.maximum(power, 0.0, out=power)
+    voltage = NOMINAL_VOLTAGE * (1.0 + _small_jitter_vec(_OUTLET_IDX * 999 + seconds // 10) * 0.15)
+    current = np.where(voltage > 0.0, power / voltage, 0.0)
+    hours = (now - START_EPOCH) / 3600.0
+    energy = np.maximum(_BASE_LOAD[1:] * _STATE_MASK[1:] * (hours / 1000.0), 0.0)
+    return np.vstack((current, voltage, power, energy))
+
+
+def outlet_table(now: Optional[float] = None) -> np.ndarray:
+    now = time.time() if now is None else now
+    return _memo(("outlet_table", 0), lambda: _outlet_table(now), now)
+
+
+def outlet_load_w(outlet: int, now: Optional[float] = None) -> float:
+    return float(outlet_table(now)[_KIND_POWER, outlet - 1])
+
+
+def outlet_voltage_v(outlet: int, now: Optional[float] = None) -> float:
+    return float(outlet_table(now)[_KIND_VOLTAGE, outlet - 1])
+
+
+def outlet_current_a(outlet: int, now: Optional[float] = None) -> float:
+    return float(outlet_table(now)[_KIND_CURRENT, outlet - 1])
+
+
+def outlet_energy_kwh(outlet: int, now: Optional[float] = None) -> float:
+    return float(outlet_table(now)[_KIND_ENERGY, outlet - 1])
+
+
+def _pdu_total_power_w(now: float) -> float:
+    return float(outlet_table(now)[_KIND_POWER].sum())
+
+
+def pdu_total_power_w(now: Optional[float] = None) -> float:
+    now = time.time() if now is None else now
+    return _memo(("pdu_total_power_w", 0), lambda: _pdu_total_power_w(now), now)
+
+
+def _pdu_total_energy_kwh(now: float) -> float:
+    return float(outlet_table(now)[_KIND_ENERGY].sum())
+
+
+def pdu_total_energy_kwh(now: Optional[float] = None) -> float:
+    now = time.time() if now is None else now
+    return _memo(("pdu_total_energy_kwh", 0), lambda: _pdu_total_energy_kwh(now), now)
+
+
+def _mains_voltage_v(phase: int, now: float) -> float:
+    seconds = int(now - START_EPOCH)
+    jitter = _small_jitter(seed=phase * 123456 + seconds // 10)
+    return NOMINAL_VOLTAGE * (1.0 + jitter * 0.10)
+
+
+def mains_voltage_v(phase: int, now: Optional[float] = None) -> float:
+    now = time.time() if now is None else now
+    return _memo(("mains_voltage_v", phase), lambda: _mains_voltage_v(phase, now), now)
+
+
+def mains_current_a(phase: int, now: Optional[float] = None) -> float:
+    now = time.time() if now is None else now
+    p = pdu_total_power_w(now)
+    v = mains_voltage_v(phase, now)
+    if v <= 0:
+        return 0.0
+    return (p / MAINS_PHASES) / v
+
+
+def metrics_values(now: Optional[float] = None) -> Tuple[float, float, float]:
+    """Rounded (power W, energy kWh, frequency Hz) triple for the Metrics doc.
+
+    Cached as one unit so the per-field round() calls run once per TTL window
+    instead of once per request.
+    """
+    now = time.time() if now is None else now
+    return _memo(
+        ("metrics_values", 0),
+        lambda: (
+            round(pdu_total_power_w(now), 2),
+            round(pdu_total_energy_kwh(now), 4),
+            round(freq_hz(now), 2),
+        ),
+        now,
+    )
+
+
+def freq_hz(now: Optional[float] = None) -> float:
+    now = time.time() if now is None else now
+
+    def compute() -> float:
+        seconds = int(now - START_EPOCH)
+        jitter = _small_jitter(seed=424242 + seconds // 30)
+        return NOMINAL_FREQ * (1.0 + jitter * 0.01)
+
+    return _memo(("freq_hz", 0), compute, now)
+
+
+# -------------------------
+# Precomputed static documents
+# -------------------------
+# These payloads never change after import, so build them once here instead of
+# reassembling the same dicts (and re-running rf_resource/rf_collection) on
+# every request. Handlers just return the module-level constant.
+
+ROLE_NAMES = ("Administrator", "Operator", "ReadOnly")
+
+_ROOT_DOC = {
+    "@odata.id": "/redfish/v1/",
+    "@odata.type": "#ServiceRoot.v1_15_0.ServiceRoot",
+    "Id": "RootService",
+    "Name": "Root Service",
+    "RedfishVersion": "1.10.0",
+    "UUID": SERVICE_UUID,
+    "SessionService": {"@odata.id": "/redfish/v1/SessionService"},
+    "AccountService": {"@odata.id": "/redfish/v1/AccountService"},
+    "Managers": {"@odata.id": "/redfish/v1/Managers"},
+    "PowerEquipment": {"@odata.id": "/redfish/v1/PowerEquipment"},
+    "EventService": {"@odata.id": "/redfish/v1/EventService"},
+}
+
+_SESSION_SERVICE_DOC = rf_resource(
+    odata_id="/redfish/v1/SessionService",
+    odata_type="#SessionService.v1_1_0.SessionService",
+    rid="SessionService",
+    name="Session Service",
+    Sessions={"@odata.id": "/redfish/v1/SessionService/Sessions"},
+)
+
+_ACCOUNT_SERVICE_DOC = rf_resource(
+    odata_id="/redfish/v1/AccountService",
+    odata_type="#AccountService.v1_5_0.AccountService",
+    rid="AccountService",
+    name="Account Service",
+    Accounts={"@odata.id": "/redfish/v1/AccountService/Accounts"},
+    Roles={"@odata.id": "/redfish/v1/AccountService/Roles"},
+)
+
+_ROLES_DOC = rf_collection(
+    odata_id="/redfish/v1/AccountService/Roles",
+    odata_type="#RoleCollection.RoleCollection",
+    name="Role Collection",
+    member_uris=[f"/redfish/v1/AccountService/Roles/{r}" for r in ROLE_NAMES],
+)
+
+_ROLE_DOCS = {
+    r: rf_resource(
+        odata_id=f"/redfish/v1/AccountService/Roles/{r}",
+        odata_type="#Role.v1_3_0.Role",
+        rid=r,
+        name=r,
+    )
+    for r in ROLE_NAMES
+}
+
+_MANAGERS_DOC = rf_collection(
+    odata_id="/redfish/v1/Managers",
+    odata_type="#ManagerCollection.ManagerCollection",
+    name="Manager Collection",
+    member_uris=["/redfish/v1/Managers/manager"],
+)
+
+_MANAGER_DOC = rf_resource(
+    odata_id="/redfish/v1/Managers/manager",
+    odata_type="#Manager.v1_11_0.Manager",
+    rid="manager",
+    name="Mock PDU Manager",
+    NetworkProtocol={"@odata.id": "/redfish/v1/Managers/managers/NetworkProtocol"},
+    LogServices={"@odata.id": "/redfish/v1/Managers/1/LogServices"},
+)
+
+_NETWORK_PROTOCOL_DOC = rf_resource(
+    odata_id="/redfish/v1/Managers/managers/NetworkProtocol",
+    odata_type="#ManagerNetworkProtocol.v1_6_0.ManagerNetworkProtocol",
+    rid="NetworkProtocol",
+    name="Network Protocol",
+    HTTP={"Port": 80},
+    HTTPS={"Port": 443},
+    SSDP={"ProtocolEnabled": False},
+)
+
+_LOG_SERVICES_DOC = rf_collection(
+    odata_id="/redfish/v1/Managers/1/LogServices",
+    odata_type="#LogServiceCollection.LogServiceCollection",
+    name="Log Service Collection",
+    member_uris=["/redfish/v1/Managers/1/LogServices/Log"],
+)
+
+_LOG_DOC = rf_resource(
+    odata_id="/redfish/v1/Managers/1/LogServices/Log",
+    odata_type="#LogService.v1_2_0.LogService",
+    rid="Log",
+    name="System Log",
+    Entries={"@odata.id": "/redfish/v1/Managers/1/LogServices/Log/Entries"},
+)
+
+_LOG_ENTRIES = [
+    {
+        "@odata.id": "/redfish/v1/Managers/1/LogServices/Log/Entries/1",
+        "@odata.type": "#LogEntry.v1_9_0.LogEntry",
+        "Id": "1",
+        "Name": "Log Entry 1",
+        "Message": "Mock PDU boot",
+        "Created": START_EPOCH,
+        "Severity": "OK",
+    },
+    {
+        "@odata.id": "/redfish/v1/Managers/1/LogServices/Log/Entries/2",
+        "@odata.type": "#LogEntry.v1_9_0.LogEntry",
+        "Id": "2",
+        "Name": "Log Entry 2",
+        "Message": "REST API enabled",
+        "Created": START_EPOCH + 1,
+        "Severity": "OK",
+    },
+]
+
+_LOG_ENTRIES_DOC = {
+    "@odata.id": "/redfish/v1/Managers/1/LogServices/Log/Entries",
+    "@odata.type": "#LogEntryCollection.LogEntryCollection",
+    "Name": "Log Entry Collection",
+    "Members@odata.count": len(_LOG_ENTRIES),
+    "Members": _LOG_ENTRIES,
+}
+
+# URI prefixes built once at import; request handlers concatenate onto these
+# instead of re-rendering the full f-string per request.
+_PDU_URI = f"/redfish/v1/PowerEquipment/RackPDUs/{PDU_ID}"
+_OUTLETS_URI = _PDU_URI + "/Outlets"
+_BRANCHES_URI = _PDU_URI + "/Branches"
+_MAINS_URI = _PDU_URI + "/Mains"
+_METRICS_URI = _PDU_URI + "/Metrics"
+_SENSORS_URI = _PDU_URI + "/Sensors"
+
+_POWER_EQUIPMENT_DOC = rf_resource(
+    odata_id="/redfish/v1/PowerEquipment",
+    odata_type="#PowerEquipment.v1_0_0.PowerEquipment",
+    rid="PowerEquipment",
+    name="Power Equipment",
+    RackPDUs={"@odata.id": "/redfish/v1/PowerEquipment/RackPDUs"},
+)
+
+_RACK_PDUS_DOC = rf_collection(
+    odata_id="/redfish/v1/PowerEquipment/RackPDUs",
+    odata_type="#PowerDistributionCollection.PowerDistributionCollection",
+    name="Rack PDU Collection",
+    member_uris=[_PDU_URI],
+)
+
+_RACK_PDU_DOC = rf_resource(
+    odata_id=_PDU_URI,
+    odata_type="#PowerDistribution.v1_1_0.PowerDistribution",
+    rid=PDU_ID,
+    name=f"Rack PDU {PDU_ID}",
+    Model=PDU_MODEL,
+    SerialNumber=f"SE-MOCK-{PDU_ID.zfill(4)}",
+    Manufacturer="Schneider Electric",
+    Outlets={"@odata.id": _OUTLETS_URI},
+    Branches={"@odata.id": _BRANCHES_URI},
+    Mains={"@odata.id": _MAINS_URI},
+    Metrics={"@odata.id": _METRICS_URI},
+    Sensors={"@odata.id": _SENSORS_URI},
+)
+
+_BRANCHES_COLLECTION_DOC = rf_collection(
+    odata_id=_BRANCHES_URI,
+    odata_type="#CircuitCollection.CircuitCollection",
+    name="Branch Collection",
+    member_uris=[
+        _BRANCHES_URI + "/" + str(i) for i in range(1, BRANCH_COUNT + 1)
+    ],
+)
+
+_BRANCH_DOCS = {
+    i: rf_resource(
+        odata_id=_BRANCHES_URI + "/" + str(i),
+        odata_type="#Circuit.v1_0_0.Circuit",
+        rid=str(i),
+        name=f"Branch {i}",
+    )
+    for i in range(1, BRANCH_COUNT + 1)
+}
+
+# Mutable collections (sessions, accounts) can't be frozen, but their URI
+# prefixes can be.
+_SESSION_URI_PREFIX = "/redfish/v1/SessionService/Sessions/"
+_ACCOUNT_URI_PREFIX = "/redfish/v1/AccountService/Accounts/"
+
+_OUTLET_MEMBER_URIS = [
+    _OUTLETS_URI + "/" + str(i) for i in range(1, OUTLET_COUNT + 1)
+]
+
+_OUTLETS_COLLECTION_DOC = rf_collection(
+    odata_id=_OUTLETS_URI,
+    odata_type="#OutletCollection.OutletCollection",
+    name="Outlet Collection",
+    member_uris=_OUTLET_MEMBER_URIS,
+)
+
+_MAINS_COLLECTION_DOC = rf_collection(
+    odata_id=_MAINS_URI,
+    odata_type="#PowerSupplyCollection.PowerSupplyCollection",
+    name="Mains Collection",
+    member_uris=[_MAINS_URI + "/AC1"],
+)
+
+_MAINS_AC1_DOC = rf_resource(
+    odata_id=_MAINS_URI + "/AC1",
+    odata_type="#PowerSupply.v1_5_0.PowerSupply",
+    rid="AC1",
+    name="Main AC Input",
+    Phases=MAINS_PHASES,
+)
+
+_SENSORS_ROOT_DOC = rf_resource(
+    odata_id=_SENSORS_URI,
+    odata_type="#SensorCollection.SensorCollection",
+    rid=f"Sensors-{PDU_ID}",
+    name="Sensors",
+    Note="Access individual sensors via /Sensors/<SensorId> (e.g., PowerOUTLET44, FreqMains, PDUPower).",
+)
+
+_EVENT_SERVICE_DOC = rf_resource(
+    odata_id="/redfish/v1/EventService",
+    odata_type="#EventService.v1_6_0.EventService",
+    rid="EventService",
+    name="Event Service",
+    Subscriptions={"@odata.id": "/redfish/v1/EventService/Subscriptions"},
+    ServerSentEventUri="/redfish/v1/EventService/SSE",
+)
+
+# Pre-encoded JSON for the static documents above. Returning the bytes in a
+# plain Response skips jsonable_encoder + json.dumps per request; static GETs
+# become little more than an auth check and a memcpy.
+_ROOT_BYTES = orjson.dumps(_ROOT_DOC)
+_SESSION_SERVICE_BYTES = orjson.dumps(_SESSION_SERVICE_DOC)
+_ACCOUNT_SERVICE_BYTES = orjson.dumps(_ACCOUNT_SERVICE_DOC)
+_ROLES_BYTES = orjson.dumps(_ROLES_DOC)
+_ROLE_BYTES = {r: orjson.dumps(doc) for r, doc in _ROLE_DOCS.items()}
+_MANAGERS_BYTES = orjson.dumps(_MANAGERS_DOC)
+_MANAGER_BYTES = orjson.dumps(_MANAGER_DOC)
+_NETWORK_PROTOCOL_BYTES = orjson.dumps(_NETWORK_PROTOCOL_DOC)
+_LOG_SERVICES_BYTES = orjson.dumps(_LOG_SERVICES_DOC)
+_LOG_BYTES = orjson.dumps(_LOG_DOC)
+_LOG_ENTRIES_BYTES = orjson.dumps(_LOG_ENTRIES_DOC)
+_POWER_EQUIPMENT_BYTES = orjson.dumps(_POWER_EQUIPMENT_DOC)
+_RACK_PDUS_BYTES = orjson.dumps(_RACK_PDUS_DOC)
+_RACK_PDU_BYTES = orjson.dumps(_RACK_PDU_DOC)
+_BRANCHES_COLLECTION_BYTES = orjson.dumps(_BRANCHES_COLLECTION_DOC)
+_BRANCH_BYTES = {i: orjson.dumps(doc) for i, doc in _BRANCH_DOCS.items()}
+_OUTLETS_COLLECTION_BYTES = orjson.dumps(_OUTLETS_COLLECTION_DOC)
+_MAINS_COLLECTION_BYTES = orjson.dumps(_MAINS_COLLECTION_DOC)
+_MAINS_AC1_BYTES = orjson.dumps(_MAINS_AC1_DOC)
+_SENSORS_ROOT_BYTES = orjson.dumps(_SENSORS_ROOT_DOC)
+_EVENT_SERVICE_BYTES = orjson.dumps(_EVENT_SERVICE_DOC)
+
+
+def _static_json(blob: bytes) -> Response:
+    return Response(content=blob, media_type="application/json")
+
+
+# -------------------------
+# Error handling
+# -------------------------
+
+# Encoded error bodies keyed by (status, code, message). raise_rf call sites
+# are a small fixed set, so after warm-up every 401/404 (sensor-probe misses
+# included) is served as pre-encoded bytes.
+_ERROR_BLOB_CACHE: Dict[Tuple[int, str, str], bytes] = {}
+
+
+@app.exception_handler(HTTPException)
+async def http_exception_handler(_: Request, exc: HTTPException):
+    # If detail is already a Redfish-like dict, return it. Otherwise wrap it.
+    if isinstance(exc.detail, dict) and "error" in exc.detail:
+        err = exc.detail["error"]
+        if "@Message.ExtendedInfo" not in err:
+            key = (exc.status_code, err.get("code", ""), err.get("message", ""))
+            blob = _ERROR_BLOB_CACHE.get(key)
+            if blob is None:
+                blob = orjson.dumps(exc.detail)
+                _ERROR_BLOB_CACHE[key] = blob
+            return Response(blob, status_code=exc.status_code, media_type="application/json")
+        return ORJSONResponse(status_code=exc.status_code, content=exc.detail)
+    return ORJSONResponse(
+        status_code=exc.status_code,
+        content=rf_error_payload("Base.1.0.GeneralError", str(exc.detail)),
+    )
+
+
+# -------------------------
+# GET endpoints (Basic Auth)
+# -------------------------
+
+@app.get("/redfish/v1/")
+async def get_root(authorization: Optional[str] = Header(None)):
+    require_basic_auth(authorization)
+    # ServiceRoot generally doesn’t include Status
+    return _static_json(_ROOT_BYTES)
+
+
+# ---- SessionService
+
+@app.get("/redfish/v1/SessionService")
+async def get_session_service(authorization: Optional[str] = Header(None)):
+    require_basic_auth(authorization)
+    return _static_json(_SESSION_SERVICE_BYTES)
+
+
+# Serialized session/account collections. These are static between
+# create/delete, so encode lazily on first GET and drop the blob whenever a
+# mutation touches the underlying index (same pattern as the frozen docs,
+# plus invalidation).
+_SESSION_COLL_BYTES: Optional[bytes] = None
+_ACCOUNT_COLL_BYTES: Optional[bytes] = None
+
+
+def _invalidate_session_collection() -> None:
+    global _SESSION_COLL_BYTES
+    _SESSION_COLL_BYTES = None
+
+
+def _invalidate_account_collection() -> None:
+    global _ACCOUNT_COLL_BYTES
+    _ACCOUNT_COLL_BYTES = None
+
+
+@app.get("/redfish/v1/SessionService/Sessions")
+async def get_sessions(authorization: Optional[str] = Header(None)):
+    global _SESSION_COLL_BYTES
+    require_basic_auth(authorization)
+    blob = _SESSION_COLL_BYTES
+    if blob is None:
+        # Build and store under _INDEX_LOCK: mutators (which may run in the
+        # threadpool) update the index and invalidate under the same lock, so
+        # a stale blob can't be cached over a concurrent create/delete.
+        with _INDEX_LOCK:
+            members = [_SESSION_URI_PREFIX + sid for sid in _SESSION_IDS_SORTED]
+            blob = _SESSION_COLL_BYTES = orjson.dumps(rf_collection(
+                odata_id="/redfish/v1/SessionService/Sessions",
+                odata_type="#SessionCollection.SessionCollection",
+                name="Session Collection",
+                member_uris=members,
+            ))
+    return _static_json(blob)
+
+
+@app.get("/redfish/v1/SessionService/Sessions/{session_id}")
+async def get_session(session_id: str, authorization: Optional[str] = Header(None)):
+    require_basic_auth(authorization)
+    s = SESSIONS.get(session_id)
+    if not s:
+        raise_rf(404, "Base.1.0.ResourceMissingAtURI", "Session not found")
+    return rf_resource(
+        odata_id=f"/redfish/v1/SessionService/Sessions/{session_id}",
+        odata_type="#Session.v1_1_0.Session",
+        rid=s.session_id,
+        name="Session",
+        status=rf_status(),
+        UserName=s.username,
+        Created=s.created_epoch,
+    )
+
+
+# ---- AccountService
+
+@app.get("/redfish/v1/AccountService")
+async def get_account_service(authorization: Optional[str] = Header(None)):
+    require_basic_auth(authorization)
+    return _static_json(_ACCOUNT_SERVICE_BYTES)
+
+
+@app.get("/redfish/v1/AccountService/Accounts")
+async def get_accounts(authorization: Optional[str] = Header(None)):
+    global _ACCOUNT_COLL_BYTES
+    require_basic_auth(authorization)
+    blob = _ACCOUNT_COLL_BYTES
+    if blob is None:
+        # Same locking as get_sessions: see the comment there.
+        with _INDEX_LOCK:
+            members = [_ACCOUNT_URI_PREFIX + u for u in _USERNAMES_SORTED]
+            blob = _ACCOUNT_COLL_BYTES = orjson.dumps(rf_collection(
+                odata_id="/redfish/v1/AccountService/Accounts",
+                odata_type="#ManagerAccountCollection.ManagerAccountCollection",
+                name="Account Collection",
+                member_uris=members,
+            ))
+    return _static_json(blob)
+
+
+@app.get("/redfish/v1/AccountService/Accounts/{username}")
+async def get_account(username: str, authorization: Optional[str] = Header(None)):
+    require_basic_auth(authorization)
+    u = USERS.get(username)
+    if not u:
+        raise_rf(404, "Base.1.0.ResourceMissingAtURI", "User not found")
+    return rf_resource(
+        odata_id=f"/redfish/v1/AccountService/Accounts/{username}",
+        odata_type="#ManagerAccount.v1_9_0.ManagerAccount",
+        rid=username,
+        name=f"Account {username}",
+        UserName=u["username"],
+        RoleId=u["role"],
+        Enabled=bool(u["enabled"]),
+    )
+
+
+@app.get("/redfish/v1/AccountService/Roles")
+async def get_roles(authorization: Optional[str] = Header(None)):
+    require_basic_auth(authorization)
+    return _static_json(_ROLES_BYTES)
+
+
+@app.get("/redfish/v1/AccountService/Roles/{rolename}")
+async def get_role(rolename: str, authorization: Optional[str] = Header(None)):
+    require_basic_auth(authorization)
+    blob = _ROLE_BYTES.get(rolename)
+    if blob is None:
+        raise_rf(404, "Base.1.0.ResourceMissingAtURI", "Role not found")
+    return _static_json(blob)
+
+
+# ---- Managers
+
+@app.get("/redfish/v1/Managers")
+async def get_managers(authorization: Optional[str] = Header(None)):
+    require_basic_auth(authorization)
+    return _static_json(_MANAGERS_BYTES)
+
+
+@app.get("/redfish/v1/Managers/manager")
+async def get_manager(authorization: Optional[str] = Header(None)):
+    require_basic_auth(authorization)
+    return _static_json(_MANAGER_BYTES)
+
+
+@app.get("/redfish/v1/Managers/managers/NetworkProtocol")
+async def get_network_protocol(authorization: Optional[str] = Header(None)):
+    require_basic_auth(authorization)
+    return _static_json(_NETWORK_PROTOCOL_BYTES)
+
+
+@app.get("/redfish/v1/Managers/1/LogServices")
+async def get_log_services(authorization: Optional[str] = Header(None)):
+    require_basic_auth(authorization)
+    return _static_json(_LOG_SERVICES_BYTES)
+
+
+@app.get("/redfish/v1/Managers/1/LogServices/Log")
+async def get_log(authorization: Optional[str] = Header(None)):
+    require_basic_auth(authorization)
+    return _static_json(_LOG_BYTES)
+
+
+@app.get("/redfish/v1/Managers/1/LogServices/Log/Entries")
+async def get_log_entries(authorization: Optional[str] = Header(None)):
+    require_basic_auth(authorization)
+    # A lightweight Entries “collection-like” payload
+    return _static_json(_LOG_ENTRIES_BYTES)
+
+
+# ---- PowerEquipment
+
+@app.get("/redfish/v1/PowerEquipment")
+async def get_power_equipment(authorization: Optional[str] = Header(None)):
+    require_basic_auth(authorization)
+    return _static_json(_POWER_EQUIPMENT_BYTES)
+
+
+@app.get("/redfish/v1/PowerEquipment/RackPDUs")
+async def get_rack_pdus(authorization: Optional[str] = Header(None)):
+    require_basic_auth(authorization)
+    return _static_json(_RACK_PDUS_BYTES)
+
+
+@app.get("/redfish/v1/PowerEquipment/RackPDUs/{pdu_id}")
+async def get_rack_pdu(pdu_id: str, authorization: Optional[str] = Header(None)):
+    require_basic_auth(authorization)
+    if pdu_id != PDU_ID:
+        raise_rf(404, "Base.1.0.ResourceMissingAtURI", "PDU not found")
+    return _static_json(_RACK_PDU_BYTES)
+
+
+# ---- Metrics
+
+@app.get("/redfish/v1/PowerEquipment/RackPDUs/{pdu_id}/Metrics")
+async def get_metrics(pdu_id: str, authorization: Optional[str] = Header(None)):
+    require_basic_auth(authorization)
+    if pdu_id != PDU_ID:
+        raise_rf(404, "Base.1.0.ResourceMissingAtURI", "PDU not found")
+
+    power_w, energy_kwh, frequency_hz = metrics_values(time.time())
+    return rf_resource(
+        odata_id=_METRICS_URI,
+        odata_type="#PowerMetrics.v1_0_0.PowerMetrics",
+        rid=f"Metrics-{PDU_ID}",
+        name="PDU Metrics",
+        # EC aggregation friendly fields:
+        PowerWatts=power_w,
+        EnergykWh=energy_kwh,
+        FrequencyHz=frequency_hz,
+    )
+
+
+# ---- Branches
+
+@app.get("/redfish/v1/PowerEquipment/RackPDUs/{pdu_id}/Branches")
+async def get_branches(pdu_id: str, authorization: Optional[str] = Header(None)):
+    require_basic_auth(authorization)
+    if pdu_id != PDU_ID:
+        raise_rf(404, "Base.1.0.ResourceMissingAtURI", "PDU not found")
+    return _static_json(_BRANCHES_COLLECTION_BYTES)
+
+
+@app.get("/redfish/v1/PowerEquipment/RackPDUs/{pdu_id}/Branches/{cbnumber}")
+async def get_branch(pdu_id: str, cbnumber: int, authorization: Optional[str] = Header(None)):
+    require_basic_auth(authorization)
+    if pdu_id != PDU_ID:
+        raise_rf(404, "Base.1.0.ResourceMissingAtURI", "PDU not found")
+    if cbnumber < 1 or cbnumber > BRANCH_COUNT:
+        raise_rf(404, "Base.1.0.ResourceMissingAtURI", "Branch not found")
+    return _static_json(_BRANCH_BYTES[cbnumber])
+
+
+# ---- Outlets
+
+@app.get("/redfish/v1/PowerEquipment/RackPDUs/{pdu_id}/Outlets")
+async def get_outlets(pdu_id: str, authorization: Optional[str] = Header(None)):
+    require_basic_auth(authorization)
+    if pdu_id != PDU_ID:
+        raise_rf(404, "Base.1.0.ResourceMissingAtURI", "PDU not found")
+
+    return _static_json(_OUTLETS_COLLECTION_BYTES)
+
+
+def _outlet_snapshot(now: float) -> dict:
+    table = _outlet_table(now)
+    power = table[_KIND_POWER]
+    energy = table[_KIND_ENERGY]
+    return {
+        str(i): {
+            "state": outlet_state(i),
+            "power_w": round(float(power[i - 1]), 2),
+            "energy_kwh": round(float(energy[i - 1]), 4),
+        }
+        for i in range(1, OUTLET_COUNT + 1)
+    }
+
+
+# Registered before the /Outlets/{outletnumber} route so "snapshot" isn't
+# swallowed by the int path parameter.
+@app.get("/redfish/v1/PowerEquipment/RackPDUs/{pdu_id}/Outlets/snapshot")
+async def get_outlets_snapshot(pdu_id: str, authorization: Optional[str] = Header(None)):
+    """All-outlet state + readings in one response.
+
+    Non-Redfish convenience endpoint: a polling client needs 3 GETs per
+    outlet (outlet resource + two sensors) to assemble this, i.e. 144
+    round-trips per refresh for the full PDU. One batched response
+    eliminates that per-request overhead.
+    """
+    require_basic_auth(authorization)
+    if pdu_id != PDU_ID:
+        raise_rf(404, "Base.1.0.ResourceMissingAtURI", "PDU not found")
+    now = time.time()
+    return _memo(("outlets_snapshot", 0), lambda: _outlet_snapshot(now), now)
+
+
+def _outlet_doc(outletnumber: int, on: bool) -> dict:
+    return rf_resource(
+        odata_id=_OUTLETS_URI + "/" + str(outletnumber),
+        odata_type="#Outlet.v1_0_0.Outlet",
+        rid=str(outletnumber),
+        name=f"Outlet {outletnumber}",
+        # Redfish-ish status (Enabled if On, Disabled if Off)
+        status=rf_status(state="Enabled" if on else "Disabled", health="OK"),
+        Connected=outlet_connected(outletnumber),
+        RatedLoadWatts=CONNECTED_OUTLET_LOAD_W.get(outletnumber, 0.0),
+        # Actions advertised (even if you don't implement this action endpoint yet)
+        Actions={
+            "#Outlet.PowerControl": {
+                "target": _OUTLETS_URI + "/" + str(outletnumber) + "/Actions/Outlet.PowerControl",
+                "PowerState@Redfish.AllowableValues": ["On", "Off", "Cycle"],
+            }
+        },
+    )
+
+
+# Outlet resources only vary in Status.State, so pre-encode both variants per
+# outlet; a GET is then an index into this table like the other static docs.
+_OUTLET_BYTES = {
+    i: (orjson.dumps(_outlet_doc(i, False)), orjson.dumps(_outlet_doc(i, True)))
+    for i in range(1, OUTLET_COUNT + 1)
+}
+
+
+@app.get("/redfish/v1/PowerEquipment/RackPDUs/{pdu_id}/Outlets/{outletnumber}")
+async def get_outlet(pdu_id: str, outletnumber: int, authorization: Optional[str] = Header(None)):
+    require_basic_auth(authorization)
+    if pdu_id != PDU_ID:
+        raise_rf(404, "Base.1.0.ResourceMissingAtURI", "PDU not found")
+    if outletnumber < 1 or outletnumber > OUTLET_COUNT:
+        raise_rf(404, "Base.1.0.ResourceMissingAtURI", "Outlet not found")
+
+    return _static_json(_OUTLET_BYTES[outletnumber][OUTLET_STATE[outletnumber]])
+
+
+# ---- Mains
+
+@app.get("/redfish/v1/PowerEquipment/RackPDUs/{pdu_id}/Mains")
+async def get_mains(pdu_id: str, authorization: Optional[str] = Header(None)):
+    require_basic_auth(authorization)
+    if pdu_id != PDU_ID:
+        raise_rf(404, "Base.1.0.ResourceMissingAtURI", "PDU not found")
+    return _static_json(_MAINS_COLLECTION_BYTES)
+
+
+@app.get("/redfish/v1/PowerEquipment/RackPDUs/{pdu_id}/Mains/AC1")
+async def get_mains_ac1(pdu_id: str, authorization: Optional[str] = Header(None)):
+    require_basic_auth(authorization)
+    if pdu_id != PDU_ID:
+        raise_rf(404, "Base.1.0.ResourceMissingAtURI", "PDU not found")
+    return _static_json(_MAINS_AC1_BYTES)
+
+
+# ---- Sensors index + Sensor GET (pattern matching the SmartPDU URL style)
+
+@app.get("/redfish/v1/PowerEquipment/RackPDUs/{pdu_id}/Sensors")
+async def get_sensors_root(pdu_id: str, authorization: Optional[str] = Header(None)):
+    require_basic_auth(authorization)
+    if pdu_id != PDU_ID:
+        raise_rf(404, "Base.1.0.ResourceMissingAtURI", "PDU not found")
+
+    # Redfish would often provide a collection. Your device lists sensor endpoints by convention,
+    # so we keep it a resource and rely on the specific sensor URIs.
+    return _static_json(_SENSORS_ROOT_BYTES)
+
+
+# Sensor-id dispatch: one alternation regex enumerating the valid prefixes,
+# so parsing and rejection of unknown ids both happen in a single C-level
+# match, followed by one dict probe. Group 1/2 carry numbered sensors
+# (prefix, index); group 3 carries the un-numbered scalar sensors.
+_SENSOR_ID_RE = re.compile(
+    r"^(?:(CurrentOUTLET|VoltageOUTLET|PowerOUTLET|EnergyOUTLET|"
+    r"CurrentMains|VoltageMains|PowerMains)(\d+)|(FreqMains|PDUPower))$"
+)
+
+# prefix -> (reading fn, reading type, units)
+_OUTLET_SENSOR_DISPATCH = {
+    "CurrentOUTLET": (outlet_current_a, "Current", "A"),
+    "VoltageOUTLET": (outlet_voltage_v, "Voltage", "V"),
+    "PowerOUTLET": (outlet_load_w, "Power", "W"),
+    "EnergyOUTLET": (outlet_energy_kwh, "Energy", "kWh"),
+}
+
+# prefix -> (max index, reading fn, name fn, reading type, units, miss message)
+_MAINS_SENSOR_DISPATCH = {
+    "CurrentMains": (
+        MAINS_PHASES,
+        mains_current_a,
+        lambda idx: f"Mains Phase {idx} Current",
+        "Current",
+        "A",
+        "Mains phase not found",
+    ),
+    "VoltageMains": (
+        6,
+        lambda idx, now: mains_voltage_v(((idx - 1) % MAINS_PHASES) + 1, now),
+        lambda idx: f"Mains Voltage Channel {idx} (Phase {((idx - 1) % MAINS_PHASES) + 1})",
+        "Voltage",
+        "V",
+        "Mains voltage index not found",
+    ),
+    "PowerMains": (
+        6,
+        lambda idx, now: pdu_total_power_w(now) / 6.0,
+        lambda idx: f"Mains Power Channel {idx}",
+        "Power",
+        "W",
+        "Mains power index not found",
+    ),
+}
+
+# un-numbered sensors -> (reading fn, name, reading type, units, context)
+_SCALAR_SENSOR_DISPATCH = {
+    "FreqMains": (freq_hz, "Mains Frequency", "Frequency", "Hz", "ACInput"),
+    "PDUPower": (pdu_total_power_w, "PDU Total Power", "Power", "W", "PowerSubsystem"),
+}
+
+# All sensor bodies share one shape, so emit them through a single
+# pre-templated byte string: one C-level %-format instead of dict assembly
+# plus JSON encoding. Values are all server-controlled, so no escaping is
+# needed.
+_SENSOR_TEMPLATE = (
+    b'{"@odata.id":"%s","@odata.type":"#Sensor.v1_7_0.Sensor","Id":"%s","Name":"%s",'
+    b'"Status":{"State":"Enabled","Health":"OK"},"ReadingType":"%s","PhysicalContext":"%s",'
+    b'"ReadingUnits":"%s","Reading":%.4f}'
+)
+
+# Serialized sensor payloads, keyed by sensor id. Readings are stable within a
+# second (see _MEASUREMENT_CACHE), so the whole JSON body is too; repeat polls
+# of the same sensor skip the dict assembly and encoding entirely.
+_SENSOR_CACHE: Dict[str, Tuple[float, bytes]] = {}
+
+
+@app.get("/redfish/v1/PowerEquipment/RackPDUs/{pdu_id}/Sensors/{sensor_id}")
+async def get_sensor(pdu_id: str, sensor_id: str, authorization: Optional[str] = Header(None)):
+    require_basic_auth(authorization)
+    if pdu_id != PDU_ID:
+        raise_rf(404, "Base.1.0.ResourceMissingAtURI", "PDU not found")
+
+    now = time.time()
+    hit = _SENSOR_CACHE.get(sensor_id)
+    if hit is not None and now - hit[0] < _MEASUREMENT_TTL_S:
+        return _static_json(hit[1])
+
+    base_uri = _SENSORS_URI + "/" + sensor_id
+
+    m = _SENSOR_ID_RE.match(sensor_id)
+    if not m:
+        raise_rf(404, "Base.1.0.ResourceMissingAtURI", "Unknown sensor")
+    prefix, digits, scalar_id = m.groups()
+
+    if scalar_id is not None:
+        reading_fn, name, rtype, units, context = _SCALAR_SENSOR_DISPATCH[scalar_id]
+        reading = reading_fn(now)
+    elif (outlet_entry := _OUTLET_SENSOR_DISPATCH.get(prefix)) is not None:
+        reading_fn, rtype, units = outlet_entry
+        outlet = int(digits)
+        if outlet < 1 or outlet > OUTLET_COUNT:
+            raise_rf(404, "Base.1.0.ResourceMissingAtURI", "Outlet not found")
+        name = f"Outlet {outlet} {rtype}"
+        context = "Outlet"
+        reading = reading_fn(outlet, now)
+    else:
+        # The regex guarantees any remaining prefix is a mains sensor.
+        max_idx, reading_fn, name_fn, rtype, units, miss = _MAINS_SENSOR_DISPATCH[prefix]
+        idx = int(digits)
+        if idx < 1 or idx > max_idx:
+            raise_rf(404, "Base.1.0.ResourceMissingAtURI", miss)
+        name = name_fn(idx)
+        context = "ACInput"
+        reading = reading_fn(idx, now)
+
+    blob = _SENSOR_TEMPLATE % (
+        base_uri.encode(),
+        sensor_id.encode(),
+        name.encode(),
+        rtype.encode(),
+        context.encode(),
+        units.encode(),
+        reading,
+    )
+    _SENSOR_CACHE[sensor_id] = (now, blob)
+    return _static_json(blob)
+
+
+# ---- EventService
+
+@app.get("/redfish/v1/EventService")
+async def get_event_service(authorization: Optional[str] = Header(None)):
+    require_basic_auth(authorization)
+    return _static_json(_EVENT_SERVICE_BYTES)
+
+
+@app.get("/redfish/v1/EventService/SSE")
+async def get_event_stream(authorization: Optional[str] = Header(None)):
+    """Server-sent events stream of outlet snapshot deltas.
+
+    The first frame carries the full snapshot; afterwards only outlets
+    whose state or readings changed are sent, so a quiescent PDU costs a
+    client nothing instead of a full re-poll per refresh interval.
+    """
+    require_basic_auth(authorization)
+
+    async def stream():
+        prev: dict = {}
+        while True:
+            snap = _outlet_snapshot(time.time())
+            delta = {k: v for k, v in snap.items() if prev.get(k) != v}
+            if delta:
+                yield b"data: " + orjson.dumps(delta) + b"\n\n"
+                prev = snap
+            await asyncio.sleep(_MEASUREMENT_TTL_S)
+
+    return StreamingResponse(stream(), media_type="text/event-stream")
+
+
+@app.get("/redfish/v1/EventService/Subscriptions/{sub_id}")
+async def get_subscription(sub_id: str, authorization: Optional[str] = Header(None)):
+    require_basic_auth(authorization)
+    s = SUBSCRIPTIONS.get(sub_id)
+    if not s:
+        raise_rf(404, "Base.1.0.ResourceMissingAtURI", "Subscription not found")
+
+    return rf_resource(
+        odata_id=f"/redfish/v1/EventService/Subscriptions/{sub_id}",
+        odata_type="#EventDestination.v1_8_0.EventDestination",
+        rid=sub_id,
+        name=f"Subscription {sub_id}",
+        Destination=s.destination,
+        EventTypes=[s.event],
+        Context=s.context,
+        Protocol=s.protocol,
+        Created=s.created_epoch,
+    )
+
+
+# -------------------------
+# POST endpoints
+# -------------------------
+
+async def _read_json_body(request: Request) -> dict:
+    # request.json() decodes through stdlib json; orjson parses these small
+    # Redfish bodies ~2-3x faster, and a parse failure becomes a Redfish 400
+    # instead of an unhandled 500.
+    raw = await request.body()
+    try:
+        return orjson.loads(raw) if raw else {}
+    except orjson.JSONDecodeError:
+        raise_rf(400, "Base.1.0.MalformedJSON", "Request body is not valid JSON")
+
+
+@app.post("/redfish/v1/SessionService/Sessions")
+async def create_session(request: Request, response: Response):
+    # Accept body credentials exactly as your snippet
+    body = await _read_json_body(request)
+    username = body.get("username")
+    password = body.get("password")
+    if not username or not password:
+        raise_rf(400, "Base.1.0.PropertyMissing", "username/password required")
+
+    user = USERS.get(username)
+    if not user or not _verify_password(user, password):
+        raise_rf(401, "Base.1.0.InvalidAuthenticationToken", "Invalid credentials")
+
+    session_id = secrets.token_hex(8)
+    token = secrets.token_hex(16)
+
+    s = Session(session_id=session_id, username=username, token=token, created_epoch=time.time())
+    SESSIONS.set(session_id, s)
+    TOKENS.set(token, s)
+    with _INDEX_LOCK:
+        bisect.insort(_SESSION_IDS_SORTED, session_id)
+        _invalidate_session_collection()
+
+    response.headers["X-Auth-Token"] = token
+    response.headers["Location"] = f"/redfish/v1/SessionService/Sessions/{session_id}"
+    response.status_code = 201
+
+    return rf_resource(
+        odata_id=f"/redfish/v1/SessionService/Sessions/{session_id}",
+        odata_type="#Session.v1_1_0.Session",
+        rid=session_id,
+        name="Session",
+        UserName=username,
+        Created=s.created_epoch,
+        # Some implementations echo token in body (your original did); keep it for convenience
+        **{"X-Auth-Token": token},
+    )
+
+
+@app.post("/redfish/v1/AccountService/Accounts")
+async def create_account(request: Request, response: Response, authorization: Optional[str] = Header(None)):
+    require_basic_auth(authorization)
+    body = await _read_json_body(request)
+
+    username = body.get("UserName") or body.get("username")
+    password = body.get("Password") or body.get("password")
+    role = body.get("RoleId") or body.get("role") or "Operator"
+
+    if not username or not password:
+        raise_rf(400, "Base.1.0.PropertyMissing", "UserName/Password required")
+    if not isinstance(username, str) or not isinstance(password, str):
+        raise_rf(400, "Base.1.0.PropertyValueFormatError", "UserName/Password must be strings")
+    if username in USERS:
+        raise_rf(409, "Base.1.0.ResourceAlreadyExists", "User already exists")
+
+    USERS.set(username, {"username": username, "password_hash": _hash_password(password), "role": role, "enabled": True})
+    with _INDEX_LOCK:
+        bisect.insort(_USERNAMES_SORTED, username)
+        _invalidate_account_collection()
+    response.status_code = 201
+    response.headers["Location"] = f"/redfish/v1/AccountService/Accounts/{username}"
+
+    return rf_resource(
+        odata_id=f"/redfish/v1/AccountService/Accounts/{username}",
+        odata_type="#ManagerAccount.v1_9_0.ManagerAccount",
+        rid=username,
+        name=f"Account {username}",
+        UserName=username,
+        RoleId=role,
+        Enabled=True,
+    )
+
+
+@app.post("/redfish/v1/EventService/Subscriptions")
+async def create_subscription(
+    request: Request,
+    response: Response,
+):
+    require_token()
+    body = await _read_json_body(request)
+
+    destination = body.get("destination")
+    event = body.get("event", "Alert")
+    context = body.get("context", "")
+    protocol = body.get("protocol", "redfish")
+
+    if not destination:
+        raise_rf(400, "Base.1.0.PropertyMissing", "destination required")
+
+    sub_id = str(next(_SUB_ID_COUNTER))
+    SUBSCRIPTIONS.set(sub_id, Subscription(
+        sub_id=sub_id,
+        destination=destination,
+        event=event,
+        context=context,
+        protocol=protocol,
+        created_epoch=time.time(),
+    ))
+
+    response.status_code = 201
+    response.headers["Location"] = f"/redfish/v1/EventService/Subscriptions/{sub_id}"
+
+    return rf_resource(
+        odata_id=f"/redfish/v1/EventService/Subscriptions/{sub_id}",
+        odata_type="#EventDestination.v1_8_0.EventDestination",
+        rid=sub_id,
+        name=f"Subscription {sub_id}",
+        Destination=destination,
+        EventTypes=[event],
+        Context=context,
+        Protocol=protocol,
+        Created=SUBSCRIPTIONS[sub_id].created_epoch,
+    )
+
+
+@app.post("/redfish/v1/PowerDistribution/{pdu_id}/PowerControl/Loadsegment/{loadseg_id}/")
+async def power_control_loadsegment(
+    pdu_id: str,
+    loadseg_id: str,
+    request: Request,
+):
+    require_token()
+    if pdu_id != PDU_ID:
+        raise_rf(404, "Base.1.0.ResourceMissingAtURI", "PDU not found")
+
+    body = await _read_json_body(request)
+    action = (body.get("Action") or body.get("action") or "").strip().lower()
+    if action not in {"on", "off", "cycle"}:
+        raise_rf(400, "Base.1.0.PropertyValueNotInList", "Action must be one of: On, Off, Cycle")
+
+    try:
+        seg = int(loadseg_id)
+    except ValueError:
+        raise_rf(400, "Base.1.0.PropertyValueFormatError", "Invalid loadseg_id")
+
+    if seg not in {1, 2, 3}:
+        raise_rf(404, "Base.1.0.ResourceMissingAtURI", "Load segment not found")
+
+    # Simple mapping: segments are 16-outlet blocks: 1..16, 17..32, 33..48
+    start = (seg - 1) * 16 + 1
+    end = seg * 16
+
+    n = end - start + 1
+    if action == "cycle":
+        OUTLET_STATE[start : end + 1] = b"\x00" * n
+        OUTLET_STATE[start : end + 1] = b"\x01" * n
+    else:
+        OUTLET_STATE[start : end + 1] = (b"\x01" if action == "on" else b"\x00") * n
+
+    _sync_state_mask()
+    _invalidate_measurement_cache()
+
+    return rf_resource(
+        odata_id=f"/redfish/v1/PowerDistribution/{PDU_ID}/PowerControl/Loadsegment/{seg}/",
+        odata_type="#ActionResponse.v1_0_0.ActionResponse",
+        rid=f"Loadsegment-{seg}",
+        name="Loadsegment PowerControl Result",
+        PduId=pdu_id,
+        LoadSegment=seg,
+        ActionApplied=action,
+        OutletsAffected=[start, end],
+    )
+
+
+# -------------------------
+# DELETE endpoints (Basic Auth)
+# -------------------------
+
+@app.delete("/redfish/v1/SessionService/Sessions/{session_id}")
+def delete_session(session_id: str, authorization: Optional[str] = Header(None)):
+    require_basic_auth(authorization)
+    s = SESSIONS.pop(session_id, None)
+    if not s:
+        raise_rf(404, "Base.1.0.ResourceMissingAtURI", "Session not found")
+    TOKENS.pop(s.token, None)
+    with _INDEX_LOCK:
+        _SESSION_IDS_SORTED.remove(session_id)
+        _invalidate_session_collection()
+    # Redfish commonly returns 204 No Content
+    return Response(status_code=204)
+
+
+@app.delete("/redfish/v1/AccountService/Accounts/{username}")
+def delete_account(username: str, authorization: Optional[str] = Header(None)):
+    require_basic_auth(authorization)
+    if username == DEFAULT_ADMIN_USER:
+        raise_rf(403, "Base.1.0.InsufficientPrivilege", "Cannot delete admin user")
+    # Pop first: concurrent deletes of the same user race in the threadpool,
+    # and only the winner may touch the index (same shape as delete_session).
+    if USERS.pop(username, None) is None:
+        raise_rf(404, "Base.1.0.ResourceMissingAtURI", "User not found")
+    with _INDEX_LOCK:
+        _USERNAMES_SORTED.remove(username)
+        _invalidate_account_collection()
+    return Response(status_code=204)
+
+
+@app.delete("/redfish/v1/EventService/Subscriptions/{sub_id}")
+def delete_subscription(sub_id: str, authorization: Optional[str] = Header(None)):
+    require_basic_auth(authorization)
+    if sub_id not in SUBSCRIPTIONS:
+        raise_rf(404, "Base.1.0.ResourceMissingAtURI", "Subscription not found")
+    SUBSCRIPTIONS.pop(sub_id, None)
+    return Response(status_code=204)
+
@@ -0,0 +1,237 @@
+"""
+Qt (PySide6) frontend for the mock SmartPDU heat map.
+
+Alternative to pdu_live_gui_heatmap.py for machines where Tk's canvas is the
+bottleneck: the whole 2x24 grid is painted in a single paintEvent through
+Qt's compiled rendering pipeline, and only refreshes that changed something
+schedule a repaint. Layout, numbering and coloring match the Tk GUI; the
+polling client (SmartPDUClient), heat LUTs and formatting helpers are shared
+with it.
+
+Requirements:
+  pip install urllib3 numpy PySide6
+  pip install httpx   # optional, enables concurrent async polling fallback
+
+Run:
+  python pdu_live_gui_qt.py --base-url http://127.0.0.1:8000 --pdu-id 2 --user admin --password 123456789 --refresh 1.0 --autoscale
+"""
+
+from __future__ import annotations
+
+import argparse
+import threading
+import time
+from typing import Dict
+
+import numpy as np
+from PySide6.QtCore import Qt, QRect, Signal
+from PySide6.QtGui import QColor, QFont, QPainter
+from PySide6.QtWidgets import (
+    QApplication,
+    QHBoxLayout,
+    QLabel,
+    QPushButton,
+    QVBoxLayout,
+    QWidget,
+)
+
+from pdu_live_gui_heatmap import (
+    OutletData,
+    SmartPDUClient,
+    fmt_energy,
+    fmt_power,
+    heat_color,
+    outlet_to_row_col,
+    state_to_on,
+)
+
+
+class HeatMapWidget(QWidget):
+    """The outlet grid, painted as one pass over a color/text array."""
+
+    CELL_W = 380
+    CELL_H = 32
+
+    def __init__(self, outlet_count: int = 48, cols: int = 2, rows: int = 24):
+        super().__init__()
+        self.outlet_count = outlet_count
+        self.cols = cols
+        self.rows = rows
+        # Per-outlet (fill hex, txt, state_txt, is_on); compared on update so
+        # unchanged frames don't trigger a repaint.
+        self._cells: Dict[int, tuple] = {}
+        self.setMinimumSize(cols * self.CELL_W, rows * self.CELL_H)
+
+    def apply_data(self, data: Dict[int, OutletData], p_min: float, p_max: float) -> None:
+        changed = False
+        for outlet, od in data.items():
+            if not 1 <= outlet <= self.outlet_count:
+                continue
+            is_on = state_to_on(od.state)
+            fill = heat_color(od.power_w, p_min, p_max, off=not is_on)
+            txt = f"{fmt_power(od.power_w)}   {fmt_energy(od.energy_kwh)}"
+            state_txt = "ON" if is_on else "OFF"
+            cell = (fill, txt, state_txt, is_on)
+            if self._cells.get(outlet) != cell:
+                self._cells[outlet] = cell
+                changed = True
+        if changed:
+            self.update()
+
+    def paintEvent(self, event) -> None:  # noqa: N802 (Qt naming)
+        painter = QPainter(self)
+        num_font = QFont("Segoe UI", 10, QFont.Bold)
+        txt_font = QFont("Segoe UI", 9)
+        for outlet in range(1, self.outlet_count + 1):
+            row, col = outlet_to_row_col(outlet)
+            rect = QRect(col * self.CELL_W, row * self.CELL_H, self.CELL_W, self.CELL_H)
+            fill, txt, state_txt, is_on = self._cells.get(
+                outlet, ("#eeeeee", "P: ...   E: ...", "...", True)
+            )
+            painter.fillRect(rect, QColor(fill))
+            painter.setPen(Qt.black)
+            painter.drawRect(rect)
+            painter.setFont(num_font)
+            painter.drawText(rect.adjusted(8, 0, 0, 0), Qt.AlignVCenter, f"{outlet:02d}")
+            painter.setFont(txt_font)
+            painter.drawText(rect.adjusted(60, 0, 0, 0), Qt.AlignVCenter, txt)
+            painter.setPen(QColor("green" if is_on else "red"))
+            painter.setFont(num_font)
+            painter.drawText(rect.adjusted(0, 0, -10, 0), Qt.AlignVCenter | Qt.AlignRight, state_txt)
+        painter.end()
+
+
+class PDUWindow(QWidget):
+    # Poll results cross from the poll thread to the GUI thread via signals
+    # (Qt's queued delivery replaces the Tk queue + after() drain).
+    data_ready = Signal(float, dict)
+    poll_error = Signal(float, str)
+
+    def __init__(
+        self,
+        client: SmartPDUClient,
+        pdu_id: str,
+        outlet_count: int = 48,
+        refresh_s: float = 1.0,
+        heat_min_w: float = 0.0,
+        heat_max_w: float = 300.0,
+        autoscale: bool = True,
+    ):
+        super().__init__()
+        self.client = client
+        self.outlet_count = outlet_count
+        self.refresh_s = refresh_s
+        self.heat_min_w = heat_min_w
+        self.heat_max_w = heat_max_w
+        self.autoscale = autoscale
+
+        self.setWindowTitle(f"SmartPDU Live Heat Map (PDU {pdu_id})")
+
+        self.status_label = QLabel("Starting...")
+        self.error_label = QLabel("")
+        self.error_label.setStyleSheet("color: red")
+        self.scale_label = QLabel("")
+        self.heatmap = HeatMapWidget(outlet_count=outlet_count)
+
+        top = QHBoxLayout()
+        top.addWidget(QLabel(f"PDU {pdu_id}"))
+        top.addStretch(1)
+        refresh_btn = QPushButton("Refresh now")
+        refresh_btn.clicked.connect(self._refresh_now)
+        top.addWidget(refresh_btn)
+
+        mid = QHBoxLayout()
+        mid.addWidget(self.status_label)
+        mid.addStretch(1)
+        mid.addWidget(self.scale_label)
+
+        layout = QVBoxLayout(self)
+        layout.addLayout(top)
+        layout.addLayout(mid)
+        layout.addWidget(self.error_label)
+        layout.addWidget(self.heatmap, stretch=1)
+
+        self.data_ready.connect(self._apply_data)
+        self.poll_error.connect(self._apply_error)
+
+        self._stop_event = threading.Event()
+        self._poll_thread = threading.Thread(target=self._poll_loop, daemon=True)
+        self._poll_thread.start()
+
+    def _apply_data(self, ts: float, data: Dict[int, OutletData]) -> None:
+        self.error_label.setText("")
+        self.status_label.setText(
+            f"Last update: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(ts))}   (refresh {self.refresh_s:.2f}s)"
+        )
+
+        powers = [od.power_w for od in data.values() if od.power_w is not None and od.power_w >= 0]
+        if self.autoscale and powers:
+            p_min, p_max = np.percentile(np.asarray(powers), [5.0, 95.0])
+            p_min, p_max = float(p_min), float(p_max)
+            if p_max - p_min < 10.0:
+                p_max = p_min + 10.0
+        else:
+            p_min = self.heat_min_w
+            p_max = self.heat_max_w
+
+        self.scale_label.setText(
+            f"Heat scale: {p_min:.0f} W .. {p_max:.0f} W" + (" (auto)" if self.autoscale else "")
+        )
+        self.heatmap.apply_data(data, p_min, p_max)
+
+    def _apply_error(self, ts: float, message: str) -> None:
+        self.error_label.setText(message)
+        self.status_label.setText(f"Update failed: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(ts))}")
+
+    def _poll_once(self) -> None:
+        try:
+            data = self.client.get_all_outlets_data(self.outlet_count)
+            self.data_ready.emit(time.time(), data)
+        except Exception as e:
+            self.poll_error.emit(time.time(), str(e))
+
+    def _poll_loop(self) -> None:
+        while not self._stop_event.is_set():
+            start = time.time()
+            self._poll_once()
+            elapsed = time.time() - start
+            self._stop_event.wait(max(0.05, self.refresh_s - elapsed))
+
+    def _refresh_now(self) -> None:
+        threading.Thread(target=self._poll_once, daemon=True).start()
+
+    def closeEvent(self, event) -> None:  # noqa: N802 (Qt naming)
+        self._stop_event.set()
+        super().closeEvent(event)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--base-url", default="http://127.0.0.1:8000")
+    ap.add_argument("--pdu-id", default="2")
+    ap.add_argument("--user", default="admin")
+    ap.add_argument("--password", default="123456789")
+    ap.add_argument("--refresh", type=float, default=1.0)
+    ap.add_argument("--autoscale", action="store_true", help="Autoscale heat map from observed power values")
+    ap.add_argument("--pmin", type=float, default=0.0, help="Fixed heat map min W (if not autoscale)")
+    ap.add_argument("--pmax", type=float, default=300.0, help="Fixed heat map max W (if not autoscale)")
+    args = ap.parse_args()
+
+    client = SmartPDUClient(args.base_url, args.pdu_id, args.user, args.password)
+
+    app = QApplication([])
+    window = PDUWindow(
+        client=client,
+        pdu_id=args.pdu_id,
+        outlet_count=48,
+        refresh_s=max(0.2, args.refresh),
+        heat_min_w=args.pmin,
+        heat_max_w=args.pmax,
+        autoscale=bool(args.autoscale),
+    )
+    window.show()
+    return app.exec()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())